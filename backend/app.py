@@ -1,36 +1,122 @@
-from flask import Flask, request, jsonify
+import base64
+import json
+import io
+import time
+import heapq
+import threading
+import click
+from flask import Blueprint, Flask, current_app, request, jsonify, Response, stream_with_context
+from werkzeug.local import LocalProxy
 from flask_cors import CORS
-from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, or_, func, insert, select, text, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.event import listen
 from datetime import datetime, timedelta
+from config import Config, engine_options, env_bool
+from models import db, Event, EventChange, EventDailyStat, EventCategoryStat, SyncState, TimeBlock, AiInsight, VoiceJob
 from voice_ai import VoiceAI
+import event_io
+from interval_index import IntervalIndex, to_minutes, to_time
+from recurrence import ExpansionCache, parse_rule
+from event_store import EventStore
+from metrics import Metrics, configure_logging
+from profiler import SamplingProfiler
+from response_cache import ResponseCache, month_tag, range_tags
+from voice_jobs import Job, QueueFull, VoiceJobQueue
 
-app = Flask(__name__)
-CORS(app)
+# Routes and CLI commands live on this blueprint; create_app() builds the
+# Flask app around it from the environment.
+api = Blueprint('api', __name__, cli_group=None)
 
-app.config['SQLALCHEMY_DATABASE_URI'] = 'mysql+pymysql://root:@localhost:3306/planifyai'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+class AppState:
+    """Caches, indexes and workers of one app, kept in app.extensions['planifyai'].
 
-db = SQLAlchemy(app)
-voice_ai = VoiceAI()
+    Shared by every request thread of a worker. The module-level names below
+    resolve to the current app's instance, so two apps in one process (tests,
+    tools) never share a cache, an index or a job queue.
+    """
 
-class Event(db.Model):
-    __tablename__ = 'events'
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(200), nullable=False)
-    description = db.Column(db.Text)
-    date = db.Column(db.Date, nullable=False)
-    start_time = db.Column(db.String(10), nullable=False)
-    end_time = db.Column(db.String(10), nullable=False)
-    category = db.Column(db.String(50), default='general')
-    priority = db.Column(db.Enum('low', 'medium', 'high'), default='medium')
+    def __init__(self):
+        self.voice_ai = VoiceAI()
+        self.interval_index = IntervalIndex()
+        self.expansion_cache = ExpansionCache()
+        self.event_store = EventStore()
+        self.response_cache = ResponseCache()
+        self.voice_jobs = VoiceJobQueue()
+        self.shutting_down = threading.Event()
 
-with app.app_context():
-    db.create_all()
+def app_state(name):
+    return LocalProxy(lambda: getattr(current_app.extensions['planifyai'], name))
 
-@app.route('/api/events', methods=['GET'])
-def get_events():
-    events = Event.query.all()
-    return jsonify([{
+voice_ai = app_state('voice_ai')
+interval_index = app_state('interval_index')
+expansion_cache = app_state('expansion_cache')
+event_store = app_state('event_store')
+response_cache = app_state('response_cache')
+voice_jobs = app_state('voice_jobs')
+shutting_down = app_state('shutting_down')
+
+# Process-wide: /metrics and the profiler describe the worker process
+metrics = Metrics()
+profiler = SamplingProfiler()
+
+voice_job_outcomes = metrics.counter('planifyai_voice_jobs_total', 'Voice jobs by outcome', ('outcome',))
+voice_job_wait = metrics.histogram('planifyai_voice_job_wait_seconds', 'Time voice jobs spend queued')
+voice_job_duration = metrics.histogram('planifyai_voice_job_duration_seconds', 'Time to parse and persist a voice job')
+metrics.gauge('planifyai_voice_jobs_queued', 'Voice jobs waiting for a worker', lambda: voice_jobs.depth)
+metrics.gauge('planifyai_voice_jobs_running', 'Voice jobs being processed', lambda: voice_jobs.running)
+metrics.gauge('planifyai_voice_cache_hits', 'VoiceAI parse results served from the cache', lambda: voice_ai.cache_hits)
+metrics.gauge('planifyai_voice_cache_misses', 'VoiceAI parses that missed the cache', lambda: voice_ai.cache_misses)
+
+def create_app(config=None):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+    # Pool settings follow the final URI, so a sqlite override gets none
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+
+    CORS(app, origins=app.config['CORS_ORIGINS'], expose_headers=['X-Next-Cursor', 'X-Sync-Token', 'ETag'])
+    db.init_app(app)
+    app.register_blueprint(api)
+    state = app.extensions['planifyai'] = AppState()
+    if app.config['VOICE_BATCH_WORKERS']:
+        state.voice_ai.workers = app.config['VOICE_BATCH_WORKERS']
+    state.voice_ai.cache_size = app.config['VOICE_CACHE_SIZE']
+
+    state.response_cache.init_app(app)
+    configure_logging(app.config['LOG_LEVEL'], app.config['LOG_FILE'])
+    if app.config['METRICS_ENABLED']:
+        metrics.init_app(app)
+        with app.app_context():
+            metrics.instrument_engine(db.engine, app.config['SLOW_QUERY_MS'] / 1000)
+        state.voice_ai.observe_extractor = metrics.observe_extractor
+
+    if app.config['AUTO_CREATE_TABLES']:
+        with app.app_context():
+            db.create_all()
+    state.voice_jobs.start(app, process_voice_job, app.config['VOICE_JOB_WORKERS'], app.config['VOICE_JOB_QUEUE_SIZE'])
+    return app
+
+def drain(app):
+    # Called on SIGTERM, while in-flight requests finish: fail readiness so
+    # the load balancer stops routing here, and refuse new voice jobs
+    app.extensions['planifyai'].shutting_down.set()
+
+def shutdown(app):
+    # Called once per worker after it stopped serving: stop the voice
+    # workers and pool and close pooled connections
+    state = app.extensions['planifyai']
+    state.shutting_down.set()
+    state.voice_jobs.close(timeout=10)
+    state.voice_ai.close()
+    state.response_cache.close()
+    with app.app_context():
+        db.engine.dispose()
+
+
+def event_to_dict(e):
+    return {
         'id': e.id,
         'title': e.title,
         'description': e.description,
@@ -38,71 +124,1095 @@ def get_events():
         'startTime': e.start_time,
         'endTime': e.end_time,
         'category': e.category,
-        'priority': e.priority
-    } for e in events])
+        'priority': e.priority,
+        'isRecurring': bool(e.is_recurring),
+        'recurringPattern': e.recurring_pattern
+    }
+
+def encode_cursor(item):
+    raw = json.dumps([item['date'], item['startTime'], item['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    date, start_time, event_id = json.loads(raw)
+    return datetime.fromisoformat(date).date(), start_time, int(event_id)
+
+def record_change(event_id, operation):
+    # Written by stamp_changes() at commit, under one sync version
+    db.session.info.setdefault('event_changes', []).append((event_id, operation))
+
+def next_sync_version():
+    # The row lock on sync_state is held until commit, so versions are
+    # handed out in commit order. Callers take it last, after any stats
+    # rows, which keeps the lock order the same in every transaction.
+    bumped = db.session.execute(
+        update(SyncState).where(SyncState.id == 1).values(version=SyncState.version + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not bumped:
+        db.session.execute(insert(SyncState).values(id=1, version=1))
+        return 1
+    return db.session.execute(select(SyncState.version).where(SyncState.id == 1)).scalar()
+
+def stamp_changes(session):
+    changes = session.info.pop('event_changes', None)
+    if changes:
+        version = next_sync_version()
+        now = datetime.utcnow()
+        session.execute(insert(EventChange), [
+            {'event_id': event_id, 'operation': operation, 'version': version, 'changed_at': now}
+            for event_id, operation in changes
+        ])
+
+def latest_sync_token():
+    return db.session.query(SyncState.version).filter(SyncState.id == 1).scalar() or 0
+
+def invalidate_cached(date, recurring=False):
+    # Collected on the session and applied once the transaction commits, so
+    # a response rebuilt in between cannot be cached under the new version
+    tags = db.session.info.setdefault('cache_tags', set())
+    tags.update(('all', month_tag(date)))
+    if recurring:
+        tags.add('recurring')
+
+def apply_cache_invalidation(session):
+    response_cache.invalidate(session.info.pop('cache_tags', None))
+
+def discard_pending_writes(session):
+    session.info.pop('cache_tags', None)
+    session.info.pop('event_changes', None)
+
+listen(db.session, 'before_commit', stamp_changes)
+listen(db.session, 'after_commit', apply_cache_invalidation)
+listen(db.session, 'after_soft_rollback', lambda session, previous_transaction: discard_pending_writes(session))
+
+def event_minutes(start_time, end_time):
+    try:
+        start = datetime.strptime(start_time, '%H:%M')
+        end = datetime.strptime(end_time, '%H:%M')
+    except (TypeError, ValueError):
+        return 0
+    return max(int((end - start).total_seconds() // 60), 0)
+
+def upsert_stat(model, count, minutes, **key):
+    # One atomic upsert, so two first writes for the same row cannot both
+    # miss it and then collide on insert
+    values = dict(key, event_count=count, total_minutes=minutes)
+    increments = {'event_count': model.event_count + count, 'total_minutes': model.total_minutes + minutes}
+    if db.session.get_bind().dialect.name == 'mysql':
+        statement = mysql.insert(model).values(**values).on_duplicate_key_update(**increments)
+    else:
+        statement = sqlite.insert(model).values(**values).on_conflict_do_update(index_elements=list(key),
+                                                                               set_=increments)
+    db.session.execute(statement)
+
+def adjust_stats(date, category, count, minutes):
+    category = category or 'general'
+    upsert_stat(EventDailyStat, count, minutes, date=date, category=category)
+    upsert_stat(EventCategoryStat, count, minutes, category=category)
+
+def adjust_event_stats(event, sign):
+    adjust_stats(event.date, event.category, sign, sign * event_minutes(event.start_time, event.end_time))
+
+def event_time(value, field):
+    # Stored as zero-padded HH:MM, which the string keyset order, the
+    # interval index and the event store all rely on
+    minutes = to_minutes(value)
+    if minutes is None:
+        raise ValueError(f'Invalid {field} {value!r}, expected HH:MM')
+    return to_time(minutes)
+
+def payload_flag(value):
+    # JSON booleans as well as the strings CSV imports and forms send
+    return str(value).lower() in ('true', '1')
+
+def event_row(data):
+    priority = data.get('priority') or 'medium'
+    if priority not in ('low', 'medium', 'high'):
+        raise ValueError(f'Invalid priority: {priority}')
+    is_recurring = payload_flag(data.get('isRecurring', ''))
+    pattern = data.get('recurringPattern') or None
+    if is_recurring:
+        parse_rule(pattern)
+    return {
+        'title': data['title'],
+        'description': data.get('description') or '',
+        'date': datetime.fromisoformat(data['date']).date(),
+        'start_time': event_time(data['startTime'], 'startTime'),
+        'end_time': event_time(data['endTime'], 'endTime'),
+        'category': data.get('category') or 'general',
+        'priority': priority,
+        'is_recurring': is_recurring,
+        'recurring_pattern': pattern
+    }
+
+def event_from_payload(data):
+    return Event(**event_row(data))
+
+def save_events(events):
+    # Adds new events with their change log rows and aggregate updates;
+    # aggregates are summed per (date, category) first so a batch touches
+    # each stats row once. The caller commits.
+    db.session.add_all(events)
+    db.session.flush()
+    totals = {}
+    for event in events:
+        record_change(event.id, 'upsert')
+        invalidate_cached(event.date, event.is_recurring)
+        key = (event.date, event.category)
+        count, minutes = totals.get(key, (0, 0))
+        totals[key] = (count + 1, minutes + event_minutes(event.start_time, event.end_time))
+    for (date, category), (count, minutes) in totals.items():
+        adjust_stats(date, category, count, minutes)
+
+def compute_stats():
+    daily = {}
+    rows = db.session.query(Event.date, Event.category, Event.start_time, Event.end_time).yield_per(1000)
+    for date, category, start_time, end_time in rows:
+        key = (date, category or 'general')
+        count, minutes = daily.get(key, (0, 0))
+        daily[key] = (count + 1, minutes + event_minutes(start_time, end_time))
+    return daily
+
+def category_totals(daily):
+    totals = {}
+    for (date, category), (count, minutes) in daily.items():
+        total_count, total_minutes = totals.get(category, (0, 0))
+        totals[category] = (total_count + count, total_minutes + minutes)
+    return totals
+
+def stored_stats():
+    return {(s.date, s.category): (s.event_count, s.total_minutes)
+            for s in EventDailyStat.query.filter(EventDailyStat.event_count != 0)}
+
+def stored_category_stats():
+    return {s.category: (s.event_count, s.total_minutes)
+            for s in EventCategoryStat.query.filter(EventCategoryStat.event_count != 0)}
+
+@api.cli.command('rebuild-stats')
+@click.option('--check', is_flag=True, help='Only compare the stored aggregates with the events table.')
+def rebuild_stats(check):
+    """Recompute analytics aggregates from the events table."""
+    expected = compute_stats()
+    expected_totals = category_totals(expected)
+    if not check:
+        EventDailyStat.query.delete()
+        EventCategoryStat.query.delete()
+        for (date, category), (count, minutes) in expected.items():
+            db.session.add(EventDailyStat(date=date, category=category, event_count=count, total_minutes=minutes))
+        for category, (count, minutes) in expected_totals.items():
+            db.session.add(EventCategoryStat(category=category, event_count=count, total_minutes=minutes))
+        db.session.commit()
+        response_cache.invalidate({'all'})
+        click.echo(f'Rebuilt {len(expected)} daily aggregates across {len(expected_totals)} categories')
+
+    # /api/analytics serves the category totals, so they are checked too
+    stored, stored_totals = stored_stats(), stored_category_stats()
+    mismatches = sorted(key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
+    for date, category in mismatches:
+        click.echo(f'Mismatch {date} {category}: stored {stored.get((date, category))}, '
+                   f'expected {expected.get((date, category))}')
+    total_mismatches = sorted(category for category in expected_totals.keys() | stored_totals.keys()
+                              if expected_totals.get(category) != stored_totals.get(category))
+    for category in total_mismatches:
+        click.echo(f'Mismatch total {category}: stored {stored_totals.get(category)}, '
+                   f'expected {expected_totals.get(category)}')
+    if mismatches or total_mismatches:
+        raise SystemExit(1)
+    click.echo('Aggregates match the events table')
+
+def changes_since(token):
+    """The last operation per event id logged after token, and the newest token."""
+    changes = db.session.query(EventChange.version, EventChange.event_id, EventChange.operation) \
+        .filter(EventChange.version > token).order_by(EventChange.version, EventChange.id).all()
+    if not changes:
+        return {}, token
+    return {event_id: op for _, event_id, op in changes}, changes[-1][0]
+
+def upserted_rows(last_ops, *columns):
+    upserted = [event_id for event_id, op in last_ops.items() if op == 'upsert']
+    for i in range(0, len(upserted), 1000):
+        yield from db.session.query(*columns).filter(Event.id.in_(upserted[i:i + 1000]))
+
+# Past this many changed events, a full reload of the interval index or
+# event store beats applying the changes row by row
+RELOAD_THRESHOLD = 1000
+
+def current_interval_index():
+    # The index is loaded once per process and then caught up from the change
+    # log, which covers writes from every worker and every write path.
+    columns = (Event.id, Event.date, Event.start_time, Event.end_time, Event.is_recurring, Event.recurring_pattern)
+    with interval_index.lock:
+        last_ops = None
+        if interval_index.loaded:
+            last_ops, token = changes_since(interval_index.sync_token)
+        if last_ops is None or len(last_ops) > RELOAD_THRESHOLD:
+            interval_index.clear()
+            token = latest_sync_token()
+            for row in db.session.query(*columns).yield_per(5000):
+                interval_index.add(*row)
+        else:
+            for event_id in last_ops:
+                interval_index.remove(event_id)
+            for row in upserted_rows(last_ops, *columns):
+                interval_index.add(*row)
+        interval_index.sync_token = token
+        interval_index.loaded = True
+    return interval_index
+
+def current_event_store():
+    # Loaded lazily and caught up from the change log like the interval index
+    columns = (Event.id, Event.date, Event.start_time, Event.end_time, Event.category,
+               Event.priority, Event.is_recurring, Event.title)
+    with event_store.lock:
+        token = event_store.sync_token
+        last_ops = None
+        if event_store.loaded:
+            last_ops, token = changes_since(token)
+        if last_ops is None or len(last_ops) > RELOAD_THRESHOLD:
+            token = latest_sync_token()
+            event_store.load(db.session.query(*columns).yield_per(5000))
+        else:
+            for event_id in last_ops:
+                event_store.remove(event_id)
+            for row in upserted_rows(last_ops, *columns):
+                event_store.add(*row)
+        event_store.sync_token = token
+        event_store.loaded = True
+    return event_store
+
+def events_in_range(date_from=None, date_to=None, cursor=None):
+    # Ordered on (date, start_time, id) so idx_events_date_time serves both
+    # the range filter and the sort; id breaks ties for a stable keyset.
+    query = Event.query
+    if date_from:
+        query = query.filter(Event.date >= date_from)
+    if date_to:
+        query = query.filter(Event.date <= date_to)
+    if cursor:
+        date, start_time, event_id = cursor
+        query = query.filter(or_(
+            Event.date > date,
+            and_(Event.date == date, Event.start_time > start_time),
+            and_(Event.date == date, Event.start_time == start_time, Event.id > event_id)
+        ))
+    return query.order_by(Event.date, Event.start_time, Event.id)
+
+def listing_key(item):
+    return item['date'], item['startTime'], item['id']
+
+def series_occurrences(e, date_from, date_to, cursor):
+    try:
+        dates = expansion_cache.expand(e.id, e.recurring_pattern, e.date, date_from or e.date, date_to)
+    except ValueError:
+        # A malformed stored rule degrades to a one-off event
+        dates = [e.date] if date_from is None or e.date >= date_from else []
+    series = event_to_dict(e)
+    for day in dates:
+        if cursor is None or (day, e.start_time, e.id) > cursor:
+            yield dict(series, date=day.isoformat(), seriesDate=series['date'])
+
+def recurring_occurrences(date_from, date_to, cursor=None):
+    # Series are expanded only over the requested window, through the LRU
+    # so repeated month/week views reuse earlier expansions. Each series
+    # yields in listing order, so they are merged lazily and a limited page
+    # builds only the occurrences it returns.
+    series = Event.query.filter(Event.is_recurring.is_(True), Event.date <= date_to).all()
+    return heapq.merge(*(series_occurrences(e, date_from, date_to, cursor) for e in series), key=listing_key)
+
+def range_error(date_from, date_to):
+    # Recurring series are expanded over the whole window, so it is capped
+    max_days = current_app.config['MAX_RANGE_DAYS']
+    if date_to is not None and (date_from is None or (date_to - date_from).days >= max_days):
+        return f'from and to may span at most {max_days} days'
+    return None
+
+def event_listing(date_from, date_to, cursor, limit):
+    """Event dicts in (date, startTime, id) order, at most limit of them.
+
+    With an upper bound (date_to) recurring series are replaced by their
+    occurrences in the window; without one they are listed as stored.
+    """
+    query = events_in_range(date_from, date_to, cursor)
+    if date_to is None:
+        return (event_to_dict(e) for e in query.limit(limit).yield_per(200))
+    query = query.filter(or_(Event.is_recurring.is_(False), Event.is_recurring.is_(None)))
+    singles = (event_to_dict(e) for e in query.limit(limit).yield_per(200))
+    merged = heapq.merge(singles, recurring_occurrences(date_from, date_to, cursor), key=listing_key)
+    if limit is None:
+        return merged
+    return (item for _, item in zip(range(limit), merged))
+
+def time_block_to_dict(b):
+    return {
+        'id': b.id,
+        'title': b.title,
+        'description': b.description,
+        'date': b.date.isoformat(),
+        'startTime': b.start_time,
+        'endTime': b.end_time,
+        'category': b.block_type,
+        'priority': 'medium',
+        'type': 'time_block'
+    }
+
+def schedule_listing(date_from, date_to):
+    """Events (with recurring occurrences) and time blocks in one (date, startTime) order.
+
+    Each source is range-filtered and sorted by its (date, start_time) index,
+    so merging them costs O(rows in range). The daily_schedule view would sort
+    both full tables first. Time blocks are fetched before the events stream
+    is opened, since MySQL allows one unbuffered result per connection.
+    """
+    blocks = [time_block_to_dict(b) for b in TimeBlock.query
+              .filter(TimeBlock.date >= date_from, TimeBlock.date <= date_to)
+              .order_by(TimeBlock.date, TimeBlock.start_time, TimeBlock.id)]
+    events = (dict(item, type='event') for item in event_listing(date_from, date_to, None, None))
+    return heapq.merge(events, blocks, key=lambda item: (item['date'], item['startTime']))
+
+def import_events(payloads, chunk_size=1000, progress=None):
+    # Rows are inserted with one executemany per chunk, all in a single
+    # transaction. executemany does not hand back generated ids on MySQL, so
+    # each chunk's ids are read back with a plain SELECT. It reads the
+    # transaction's snapshot without locking, and so sees this import's rows
+    # but nothing committed by other writers since. The change rows are
+    # written from those ids once sync_state, always locked last, is taken.
+    started = time.perf_counter()
+    last_id = db.session.query(func.max(Event.id)).scalar() or 0
+    imported = 0
+    totals = {}
+    recurring = False
+    chunk = []
+    ids = []
+    one_off = []
+
+    def insert_chunk():
+        nonlocal last_id
+        db.session.execute(insert(Event), chunk)
+        ids.extend(db.session.execute(select(Event.id).where(Event.id > last_id).order_by(Event.id)).scalars())
+        if ids:
+            last_id = ids[-1]
+
+    try:
+        for n, data in enumerate(payloads, 1):
+            if payload_flag(data.get('isRecurring', '')):
+                # Rules outside the supported subset (e.g. FREQ=YEARLY) keep
+                # their first occurrence rather than failing the whole file
+                try:
+                    parse_rule(data.get('recurringPattern') or None)
+                except ValueError as e:
+                    one_off.append({'row': n, 'title': data.get('title'), 'error': str(e)})
+                    data = dict(data, isRecurring=False, recurringPattern=None)
+            try:
+                row = event_row(data)
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f'Row {n}: missing or invalid field {e}')
+            chunk.append(row)
+            recurring = recurring or row['is_recurring']
+            key = (row['date'], row['category'])
+            count, minutes = totals.get(key, (0, 0))
+            totals[key] = (count + 1, minutes + event_minutes(row['start_time'], row['end_time']))
+            if len(chunk) >= chunk_size:
+                insert_chunk()
+                imported += len(chunk)
+                chunk = []
+                if progress:
+                    progress(imported, time.perf_counter() - started)
+        if chunk:
+            insert_chunk()
+            imported += len(chunk)
+
+        for (date, category), (count, minutes) in totals.items():
+            adjust_stats(date, category, count, minutes)
+            invalidate_cached(date, recurring)
+        version, now = next_sync_version(), datetime.utcnow()
+        for start in range(0, len(ids), chunk_size):
+            db.session.execute(insert(EventChange), [
+                {'event_id': event_id, 'operation': 'upsert', 'version': version, 'changed_at': now}
+                for event_id in ids[start:start + chunk_size]
+            ])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    elapsed = time.perf_counter() - started
+    return {
+        'imported': imported,
+        'seconds': round(elapsed, 3),
+        'rowsPerSecond': round(imported / elapsed) if elapsed else imported,
+        'importedAsOneOff': one_off
+    }
+
+def export_events(fmt, date_from=None, date_to=None):
+    # Plain column rows streamed through a server-side cursor, so memory
+    # stays flat regardless of table size
+    rows = events_in_range(date_from, date_to).with_entities(
+        Event.id, Event.title, Event.description, Event.date, Event.start_time,
+        Event.end_time, Event.category, Event.priority, Event.is_recurring, Event.recurring_pattern
+    ).yield_per(1000)
+    return event_io.write_events((event_to_dict(row) for row in rows), fmt)
+
+@api.cli.command('import-events')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(event_io.FORMATS), help='Defaults to the file extension.')
+@click.option('--chunk-size', default=1000, show_default=True, help='Rows per batched insert.')
+def import_events_command(path, fmt, chunk_size):
+    """Bulk import events from an ICS, CSV or NDJSON file."""
+    fmt = fmt or event_io.format_from_filename(path)
+    if fmt is None:
+        raise click.UsageError('Cannot infer the format from the file name; pass --format')
+
+    def progress(imported, elapsed):
+        click.echo(f'{imported} rows ({imported / elapsed:.0f} rows/s)')
+
+    with open(path, encoding='utf-8', newline='') as f:
+        try:
+            report = import_events(event_io.read_events(f, fmt), chunk_size, progress)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    for item in report['importedAsOneOff']:
+        click.echo(f"Row {item['row']}: imported as a one-off event ({item['error']})")
+    click.echo(f"Imported {report['imported']} events in {report['seconds']}s "
+               f"({report['rowsPerSecond']} rows/s)")
+
+@api.cli.command('export-events')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--format', 'fmt', type=click.Choice(event_io.FORMATS), help='Defaults to the file extension.')
+@click.option('--from', 'date_from', type=click.DateTime(['%Y-%m-%d']))
+@click.option('--to', 'date_to', type=click.DateTime(['%Y-%m-%d']))
+def export_events_command(path, fmt, date_from, date_to):
+    """Stream events to an ICS, CSV or NDJSON file."""
+    fmt = fmt or event_io.format_from_filename(path)
+    if fmt is None:
+        raise click.UsageError('Cannot infer the format from the file name; pass --format')
+
+    started = time.perf_counter()
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in export_events(fmt, date_from and date_from.date(), date_to and date_to.date()):
+            f.write(chunk)
+    elapsed = time.perf_counter() - started
+    click.echo(f'Wrote {path} in {elapsed:.3f}s')
+
+@api.route('/api/events', methods=['GET'])
+def get_events():
+    max_events = current_app.config['MAX_EVENTS_PER_REQUEST']
+    try:
+        date_from = datetime.fromisoformat(request.args['from']).date() if 'from' in request.args else None
+        date_to = datetime.fromisoformat(request.args['to']).date() if 'to' in request.args else None
+        cursor = decode_cursor(request.args['cursor']) if 'cursor' in request.args else None
+        limit = min(int(request.args.get('limit', max_events)), max_events)
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid from, to, cursor or limit parameter'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    error = range_error(date_from, date_to)
+    if error:
+        return jsonify({'error': error}), 400
+
+    streaming = request.args.get('stream') == '1' or request.accept_mimetypes.best == 'application/x-ndjson'
+    params = request.query_string.decode()
+
+    # A cached page keeps the sync token it was built at; its tags' versions
+    # in the key guarantee no write has touched the range since.
+    cache_key = None
+    if response_cache.enabled and not streaming:
+        cache_key = response_cache.key('events', params, range_tags(date_from, date_to))
+        page = response_cache.get('events', cache_key)
+        if page is not None:
+            return listing_response(page)
+
+    sync_token = latest_sync_token()
+    etag = '%d-%s' % (sync_token, params)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    # One extra item tells whether another page exists
+    listing = event_listing(date_from, date_to, cursor, limit + 1)
+
+    if streaming:
+        # Rows are serialized as they are fetched; yield_per keeps only one
+        # batch of ORM objects alive at a time.
+        # A trailing {"nextCursor": ...} line marks a truncated page.
+        def generate():
+            last = None
+            for n, item in enumerate(listing):
+                if n == limit:
+                    yield json.dumps({'nextCursor': encode_cursor(last)}) + '\n'
+                    break
+                last = item
+                yield json.dumps(item) + '\n'
+        response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        response.set_etag(etag)
+        response.headers['X-Sync-Token'] = str(sync_token)
+        return response
+
+    events = list(listing)
+    page = {
+        'body': jsonify(events[:limit]).get_data(as_text=True),
+        'nextCursor': encode_cursor(events[limit - 1]) if len(events) > limit else None,
+        'etag': etag,
+        'syncToken': sync_token
+    }
+    if cache_key is not None:
+        response_cache.set(cache_key, page)
+    return listing_response(page)
+
+def listing_response(page):
+    if request.if_none_match.contains(page['etag']):
+        response = Response(status=304)
+    else:
+        response = Response(page['body'], mimetype='application/json')
+        if page['nextCursor']:
+            response.headers['X-Next-Cursor'] = page['nextCursor']
+    response.set_etag(page['etag'])
+    response.headers['X-Sync-Token'] = str(page['syncToken'])
+    return response
+
+@api.route('/api/schedule', methods=['GET'])
+def get_schedule():
+    try:
+        date_from = datetime.fromisoformat(request.args['from']).date()
+        date_to = datetime.fromisoformat(request.args['to']).date()
+    except (KeyError, ValueError):
+        return jsonify({'error': 'from and to (YYYY-MM-DD) are required'}), 400
+    if date_to < date_from:
+        return jsonify({'error': 'to must not be before from'}), 400
+    error = range_error(date_from, date_to)
+    if error:
+        return jsonify({'error': error}), 400
+
+    listing = schedule_listing(date_from, date_to)
+    if request.args.get('stream') == '1' or request.accept_mimetypes.best == 'application/x-ndjson':
+        return Response(stream_with_context(json.dumps(item) + '\n' for item in listing),
+                        mimetype='application/x-ndjson')
+
+    # Streamed as one JSON array, so memory stays flat for long ranges
+    def generate():
+        separator = '['
+        for item in listing:
+            yield separator + json.dumps(item)
+            separator = ','
+        yield '[]' if separator == '[' else ']'
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+@api.route('/api/events/changes', methods=['GET'])
+def get_event_changes():
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        return jsonify({'error': 'Invalid since token'}), 400
+
+    max_events = current_app.config['MAX_EVENTS_PER_REQUEST']
+    changes = EventChange.query.filter(EventChange.version > since) \
+        .order_by(EventChange.version, EventChange.id).limit(max_events + 1).all()
+    has_more = len(changes) > max_events
+    if has_more:
+        # Pages end on a whole version, since the token cannot point inside one
+        cut = changes[max_events].version
+        changes = [c for c in changes if c.version < cut]
+        if not changes:
+            # One write (a bulk import) changed more than a page of events
+            return jsonify({'events': [], 'deleted': [], 'syncToken': since, 'hasMore': False, 'reset': True})
+
+    # Only the last operation per event matters
+    last_ops = {c.event_id: c.operation for c in changes}
+    upserted = [event_id for event_id, op in last_ops.items() if op == 'upsert']
+    events = Event.query.filter(Event.id.in_(upserted)).all() if upserted else []
+
+    return jsonify({
+        'events': [event_to_dict(e) for e in events],
+        'deleted': [event_id for event_id, op in last_ops.items() if op == 'delete'],
+        'syncToken': changes[-1].version if changes else since,
+        'hasMore': has_more
+    })
+
+@api.route('/api/events/import', methods=['POST'])
+def import_events_route():
+    fmt = request.args.get('format')
+    upload = request.files.get('file')
+    if fmt is None and upload is not None:
+        fmt = event_io.format_from_filename(upload.filename or '')
+    if fmt not in event_io.FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(event_io.FORMATS)}"}), 400
+    try:
+        chunk_size = max(int(request.args.get('chunk_size', 1000)), 1)
+    except ValueError:
+        return jsonify({'error': 'Invalid chunk_size parameter'}), 400
+
+    # Read the upload (or the raw body) line by line instead of buffering it
+    stream = upload.stream if upload is not None else request.stream
+    lines = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    try:
+        report = import_events(event_io.read_events(lines, fmt), chunk_size)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(report), 201
+
+@api.route('/api/events/export', methods=['GET'])
+def export_events_route():
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in event_io.FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(event_io.FORMATS)}"}), 400
+    try:
+        date_from = datetime.fromisoformat(request.args['from']).date() if 'from' in request.args else None
+        date_to = datetime.fromisoformat(request.args['to']).date() if 'to' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'Invalid from or to parameter'}), 400
 
-@app.route('/api/events', methods=['POST'])
+    mimetypes = {'csv': 'text/csv', 'ics': 'text/calendar', 'ndjson': 'application/x-ndjson'}
+    response = Response(stream_with_context(export_events(fmt, date_from, date_to)), mimetype=mimetypes[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=events.{fmt}'
+    return response
+
+@api.route('/api/events', methods=['POST'])
 def create_event():
-    data = request.get_json()
-    event = Event(
-        title=data['title'],
-        description=data.get('description', ''),
-        date=datetime.fromisoformat(data['date']),
-        start_time=data['startTime'],
-        end_time=data['endTime'],
-        category=data.get('category', 'general'),
-        priority=data.get('priority', 'medium')
-    )
-    db.session.add(event)
+    try:
+        event = event_from_payload(request.get_json())
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': f'Invalid event: {e}'}), 400
+    save_events([event])
     db.session.commit()
     return jsonify({'id': event.id}), 201
 
-@app.route('/api/events/<int:event_id>', methods=['PUT'])
+@api.route('/api/events/<int:event_id>', methods=['PUT'])
 def update_event(event_id):
     event = Event.query.get_or_404(event_id)
     data = request.get_json()
+    is_recurring = payload_flag(data['isRecurring']) if 'isRecurring' in data else bool(event.is_recurring)
+    pattern = data.get('recurringPattern', event.recurring_pattern)
+    if is_recurring:
+        try:
+            parse_rule(pattern)
+        except ValueError as e:
+            return jsonify({'error': f'Invalid recurrence: {e}'}), 400
+    try:
+        start_time = event_time(data['startTime'], 'startTime') if 'startTime' in data else event.start_time
+        end_time = event_time(data['endTime'], 'endTime') if 'endTime' in data else event.end_time
+        date = datetime.fromisoformat(data['date']).date() if 'date' in data else event.date
+        priority = data.get('priority', event.priority)
+        if priority not in ('low', 'medium', 'high'):
+            raise ValueError(f'Invalid priority: {priority}')
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid event: {e}'}), 400
+    adjust_event_stats(event, -1)
+    invalidate_cached(event.date, event.is_recurring)
     event.title = data.get('title', event.title)
     event.description = data.get('description', event.description)
-    event.date = datetime.fromisoformat(data['date']) if 'date' in data else event.date
-    event.start_time = data.get('startTime', event.start_time)
-    event.end_time = data.get('endTime', event.end_time)
+    event.date = date
+    event.start_time = start_time
+    event.end_time = end_time
     event.category = data.get('category', event.category)
-    event.priority = data.get('priority', event.priority)
+    event.priority = priority
+    event.is_recurring = is_recurring
+    event.recurring_pattern = pattern
+    expansion_cache.invalidate(event.id)
+    invalidate_cached(event.date, event.is_recurring)
+    record_change(event.id, 'upsert')
+    adjust_event_stats(event, 1)
     db.session.commit()
     return jsonify({'message': 'Event updated'})
 
-@app.route('/api/events/<int:event_id>', methods=['DELETE'])
+@api.route('/api/events/<int:event_id>', methods=['DELETE'])
 def delete_event(event_id):
     event = Event.query.get_or_404(event_id)
     db.session.delete(event)
+    record_change(event.id, 'delete')
+    adjust_event_stats(event, -1)
+    expansion_cache.invalidate(event.id)
+    invalidate_cached(event.date, event.is_recurring)
     db.session.commit()
     return jsonify({'message': 'Event deleted'})
 
-@app.route('/api/analytics', methods=['GET'])
+@api.route('/api/events/conflicts', methods=['GET'])
+def get_conflicts():
+    try:
+        date_from = datetime.fromisoformat(request.args['from']).date() if 'from' in request.args else None
+        date_to = datetime.fromisoformat(request.args['to']).date() if 'to' in request.args else None
+        date = datetime.fromisoformat(request.args['date']).date() if 'date' in request.args else None
+        exclude = int(request.args['exclude']) if 'exclude' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'Invalid date, from, to or exclude parameter'}), 400
+    index = current_interval_index()
+
+    # With date/startTime/endTime, check a proposed slot instead of listing
+    # existing overlaps
+    if date is not None:
+        start = to_minutes(request.args.get('startTime'))
+        end = to_minutes(request.args.get('endTime'))
+        if start is None or end is None:
+            return jsonify({'error': 'startTime and endTime must be HH:MM'}), 400
+        with index.lock:
+            return jsonify({'conflicts': index.overlapping(date, start, end, exclude)})
+
+    max_events = current_app.config['MAX_EVENTS_PER_REQUEST']
+    with index.lock:
+        pairs = []
+        for day, first, second in index.conflicts(date_from, date_to):
+            if len(pairs) == max_events:
+                break
+            pairs.append({'date': day.isoformat(), 'events': [first, second]})
+    return jsonify(pairs)
+
+@api.route('/api/slots/free', methods=['GET'])
+def get_free_slots():
+    try:
+        date = datetime.fromisoformat(request.args['date']).date()
+        duration = int(request.args.get('duration', 60))
+    except (KeyError, ValueError):
+        return jsonify({'error': 'date (YYYY-MM-DD) and an integer duration are required'}), 400
+    day_start = to_minutes(request.args.get('dayStart', '00:00'))
+    day_end = to_minutes(request.args['dayEnd']) if 'dayEnd' in request.args else 24 * 60
+    if duration < 1 or day_start is None or day_end is None:
+        return jsonify({'error': 'Invalid duration, dayStart or dayEnd parameter'}), 400
+
+    index = current_interval_index()
+    with index.lock:
+        slots = index.free_slots(date, duration, day_start, day_end)
+    return jsonify([{'startTime': to_time(start), 'endTime': to_time(end)} for start, end in slots])
+
+@api.route('/api/analytics', methods=['GET'])
 def get_analytics():
-    from sqlalchemy import func
-    
-    # Category breakdown
-    category_stats = db.session.query(
-        Event.category,
-        func.count(Event.id).label('count')
-    ).group_by(Event.category).all()
-    
+    # The weekly count is relative to today, so the day is part of the key
+    today = datetime.now().date()
+    cache_key = None
+    if response_cache.enabled:
+        cache_key = response_cache.key('analytics', today.isoformat(), ['all'])
+        body = response_cache.get('analytics', cache_key)
+        if body is not None:
+            return Response(body, mimetype='application/json')
+
+    # Answered from the aggregate tables kept in step with event writes;
+    # run `flask --app app rebuild-stats` to backfill them.
+    category_stats = EventCategoryStat.query.filter(EventCategoryStat.event_count > 0).all()
+
     # Weekly stats
-    week_ago = datetime.now().date() - timedelta(days=7)
-    weekly_events = Event.query.filter(Event.date >= week_ago).count()
-    
+    week_ago = today - timedelta(days=7)
+    weekly_events = db.session.query(func.sum(EventDailyStat.event_count)) \
+        .filter(EventDailyStat.date >= week_ago).scalar() or 0
+
+    response = jsonify({
+        'categories': [{'name': stat.category, 'count': stat.event_count, 'minutes': stat.total_minutes}
+                       for stat in category_stats],
+        'weeklyEvents': int(weekly_events),
+        'totalEvents': sum(stat.event_count for stat in category_stats)
+    })
+    if cache_key is not None:
+        response_cache.set(cache_key, response.get_data(as_text=True))
+    return response
+
+@api.route('/api/analytics/insights', methods=['GET'])
+def get_analytics_insights():
+    if not current_app.config['EVENT_STORE_ENABLED']:
+        return jsonify({'error': 'The event store is disabled'}), 404
+    try:
+        date_to = datetime.fromisoformat(request.args['to']).date() if 'to' in request.args else datetime.now().date()
+        date_from = datetime.fromisoformat(request.args['from']).date() if 'from' in request.args \
+            else date_to - timedelta(weeks=12, days=-1)
+    except ValueError:
+        return jsonify({'error': 'Invalid from or to parameter'}), 400
+    if date_to < date_from:
+        return jsonify({'error': 'to must not be before from'}), 400
+
+    store = current_event_store()
+    with store.lock:
+        categories = store.category_totals(date_from, date_to)
+        hourly_events, hourly_minutes = store.hourly_load(date_from, date_to)
+        weeks = store.weekly_load(date_from, date_to)
     return jsonify({
-        'categories': [{'name': stat.category, 'count': stat.count} for stat in category_stats],
-        'weeklyEvents': weekly_events,
-        'totalEvents': Event.query.count()
+        'from': date_from.isoformat(),
+        'to': date_to.isoformat(),
+        'categories': [{'name': name, 'count': count, 'minutes': minutes}
+                       for name, (count, minutes) in sorted(categories.items(), key=lambda c: -c[1][1])],
+        'busiestHours': sorted(({'hour': hour, 'events': hourly_events[hour], 'minutes': hourly_minutes[hour]}
+                                for hour in range(24) if hourly_minutes[hour] or hourly_events[hour]),
+                               key=lambda h: -h['minutes']),
+        'weeklyLoad': [{'weekStart': monday.isoformat(), 'events': count, 'minutes': minutes}
+                       for monday, count, minutes in weeks]
+    })
+
+@api.route('/api/events/summary', methods=['GET'])
+def get_events_summary():
+    if not current_app.config['EVENT_STORE_ENABLED']:
+        return jsonify({'error': 'The event store is disabled'}), 404
+    try:
+        date_from = datetime.fromisoformat(request.args['from']).date()
+        date_to = datetime.fromisoformat(request.args['to']).date()
+    except (KeyError, ValueError):
+        return jsonify({'error': 'from and to (YYYY-MM-DD) are required'}), 400
+
+    store = current_event_store()
+    with store.lock:
+        rows = list(store.rows(date_from, date_to))
+    return jsonify(rows)
+
+@api.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    with event_store.lock:
+        # Not loaded until the first insights or summary request
+        store = {'loaded': event_store.loaded, 'events': len(event_store), 'memoryBytes': event_store.memory_bytes()}
+    store['bytesPerEvent'] = round(store['memoryBytes'] / store['events']) if store['events'] else None
+    return jsonify({**response_cache.stats(), 'voiceAI': voice_ai.cache_stats(),
+                    'recurrenceExpansion': expansion_cache.stats(), 'eventStore': store})
+
+def annotate_conflicts(result):
+    # Flag double-bookings and propose the closest free slot that day
+    parsed = result['event']
+    date = datetime.fromisoformat(parsed['date']).date()
+    start = to_minutes(parsed['time'])
+    index = current_interval_index()
+    with index.lock:
+        conflicts = index.overlapping(date, start, start + parsed['duration'])
+        suggested = index.nearest_free_slot(date, start, parsed['duration']) if conflicts else None
+    result['conflicts'] = conflicts
+    if suggested is not None:
+        result['suggestedSlot'] = {'time': to_time(suggested), 'endTime': to_time(suggested + parsed['duration'])}
+    return result
+
+def parsed_event(parsed):
+    return event_from_payload({
+        'title': parsed['title'],
+        'date': parsed['date'],
+        'startTime': parsed['time'],
+        'endTime': parsed['endTime'],
+        'category': parsed['category'],
+        'priority': parsed['priority']
     })
 
-@app.route('/api/ai/process-voice', methods=['POST'])
+@api.route('/api/ai/process-voice', methods=['POST'])
 def process_voice():
     data = request.get_json()
     result = voice_ai.process_voice_command(data.get('transcript', ''))
-    return jsonify(result)
+    return jsonify(annotate_conflicts(result))
+
+@api.route('/api/ai/process-voice/batch', methods=['POST'])
+def process_voice_batch():
+    data = request.get_json()
+    transcripts = data.get('transcripts', [])
+    if len(transcripts) > current_app.config['MAX_EVENTS_PER_REQUEST']:
+        return jsonify({'error': 'Too many transcripts in one batch'}), 400
+    save = bool(data.get('save'))
+
+    # One line per transcript, in input order; with save=true the parsed
+    # events are inserted in a single commit and a summary line follows.
+    # The 200 is already sent by then, so a failure ends the stream with an
+    # {"error": ...} line instead.
+    def generate():
+        events = []
+        try:
+            for index, result in enumerate(voice_ai.process_many(transcripts)):
+                yield json.dumps({'index': index, **result}) + '\n'
+                if save and result['success']:
+                    events.append(parsed_event(result['event']))
+            if save:
+                save_events(events)
+                db.session.commit()
+                yield json.dumps({'saved': len(events), 'ids': [e.id for e in events]}) + '\n'
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.exception('Voice batch failed')
+            yield json.dumps({'error': f'Batch failed, nothing was saved: {e}'}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def process_voice_job(job):
+    # Runs on a voice job worker thread, inside an app context
+    config = current_app.config
+    result = voice_ai.process_safe(job.transcript)
+    outcome, status, error, event_id, insight_id = 'failed', 'failed', None, None, None
+    try:
+        if result['success']:
+            annotate_conflicts(result)
+            # Double-bookings always wait for the user to confirm
+            applied = result['confidence'] >= config['AI_CONFIDENCE_THRESHOLD'] and not result['conflicts']
+            if applied:
+                event = parsed_event(result['event'])
+                save_events([event])
+                event_id = event.id
+            if not applied or config['AI_LEARNING_ENABLED']:
+                insight = AiInsight(insight_type='voice_command', title=result['event']['title'][:200],
+                                    description=job.transcript, confidence_score=result['confidence'],
+                                    data=json.dumps(result), is_applied=applied)
+                db.session.add(insight)
+                db.session.flush()
+                insight_id = insight.id
+            status = 'done'
+            outcome = 'saved' if applied else 'suggested'
+        else:
+            error = result['error']
+
+        record = db.session.get(VoiceJob, job.id) or VoiceJob(id=job.id, transcript=job.transcript)
+        record.status = status
+        record.result = json.dumps(result)
+        record.error = error
+        record.event_id = event_id
+        record.insight_id = insight_id
+        record.finished_at = datetime.utcnow()
+        db.session.add(record)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        voice_job_outcomes.inc('error')
+        mark_voice_job_failed(job, str(e))
+        raise
+    # Published only once committed, so a poll never sees an uncommitted
+    # event id; status goes last since pollers key off it
+    job.result, job.error, job.event_id, job.insight_id = result, error, event_id, insight_id
+    job.status = status
+    voice_job_outcomes.inc(outcome)
+    voice_job_wait.observe(job.started - job.submitted)
+    voice_job_duration.observe(time.time() - job.started)
+
+    if voice_jobs.completed % 100 == 0:
+        purge_voice_jobs(config['VOICE_JOB_RETENTION_HOURS'])
+
+def purge_voice_jobs(retention_hours):
+    # The job itself is committed by now; a failed purge must not mark it failed
+    try:
+        cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+        VoiceJob.query.filter(VoiceJob.finished_at < cutoff).delete()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception('Could not purge finished voice jobs')
+
+def mark_voice_job_failed(job, error):
+    # A fresh transaction after the rollback, so pollers in other workers
+    # see the failure instead of a row left queued
+    try:
+        record = db.session.get(VoiceJob, job.id) or VoiceJob(id=job.id, transcript=job.transcript)
+        record.status = 'failed'
+        record.result = None
+        record.error = error
+        record.event_id = record.insight_id = None
+        record.finished_at = datetime.utcnow()
+        db.session.add(record)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception('Could not mark voice job %s failed', job.id)
+    job.event_id = job.insight_id = None
+
+def utc_isoformat(timestamp):
+    return datetime.utcfromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+def voice_job_to_dict(job):
+    return {
+        'id': job.id,
+        'status': job.status,
+        'result': job.result,
+        'error': job.error,
+        'eventId': job.event_id,
+        'insightId': job.insight_id,
+        'submittedAt': utc_isoformat(job.submitted),
+        'finishedAt': utc_isoformat(job.finished)
+    }
+
+def voice_job_record_to_dict(record):
+    return {
+        'id': record.id,
+        'status': record.status,
+        'result': json.loads(record.result) if record.result else None,
+        'error': record.error,
+        'eventId': record.event_id,
+        'insightId': record.insight_id,
+        'submittedAt': record.created_at.isoformat() if record.created_at else None,
+        'finishedAt': record.finished_at.isoformat() if record.finished_at else None
+    }
+
+@api.route('/api/ai/jobs', methods=['POST'])
+def submit_voice_job():
+    data = request.get_json(silent=True) or {}
+    transcript = data.get('transcript')
+    if not isinstance(transcript, str) or not transcript.strip():
+        return jsonify({'error': 'transcript is required'}), 400
+
+    # Shed load before touching the database when the queue is full
+    if shutting_down.is_set() or not voice_jobs.accepting():
+        voice_job_outcomes.inc('rejected')
+        return jsonify({'error': 'Voice job queue is full, retry shortly'}), 503, {'Retry-After': '1'}
+
+    # The row exists before a worker can pick the job up
+    job = Job(transcript)
+    db.session.add(VoiceJob(id=job.id, transcript=transcript))
+    db.session.commit()
+    try:
+        voice_jobs.submit(job)
+    except QueueFull:
+        VoiceJob.query.filter_by(id=job.id).delete()
+        db.session.commit()
+        voice_job_outcomes.inc('rejected')
+        return jsonify({'error': 'Voice job queue is full, retry shortly'}), 503, {'Retry-After': '1'}
+    return jsonify({'id': job.id, 'status': job.status, 'queued': voice_jobs.depth}), 202, \
+        {'Location': f'/api/ai/jobs/{job.id}'}
+
+@api.route('/api/ai/jobs/stats', methods=['GET'])
+def get_voice_job_stats():
+    return jsonify(voice_jobs.stats())
+
+@api.route('/api/ai/jobs/<job_id>', methods=['GET'])
+def get_voice_job(job_id):
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), current_app.config['VOICE_JOB_MAX_WAIT'])
+    except ValueError:
+        return jsonify({'error': 'Invalid wait parameter'}), 400
+
+    job = voice_jobs.get(job_id)
+    if job is not None:
+        if wait:
+            job.done.wait(wait)
+        return jsonify(voice_job_to_dict(job))
+
+    # Queued by another worker process: poll its row until it finishes
+    deadline = time.monotonic() + wait
+    while True:
+        record = db.session.get(VoiceJob, job_id)
+        if record is None:
+            return jsonify({'error': 'Unknown job'}), 404
+        if record.status != 'queued' or time.monotonic() >= deadline:
+            return jsonify(voice_job_record_to_dict(record))
+        # End the transaction so the next read sees the other worker's commit
+        db.session.rollback()
+        time.sleep(0.25)
+
+@api.route('/health/live', methods=['GET'])
+def liveness():
+    return jsonify({'status': 'alive'})
+
+@api.route('/health/ready', methods=['GET'])
+def readiness():
+    if shutting_down.is_set():
+        return jsonify({'status': 'shutting down'}), 503
+    try:
+        db.session.execute(text('SELECT 1'))
+    except Exception as e:
+        return jsonify({'status': 'database unavailable', 'error': str(e)}), 503
+    return jsonify({'status': 'ready'})
+
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    if not current_app.config['METRICS_ENABLED']:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@api.route('/debug/profiler', methods=['GET', 'POST', 'DELETE'])
+def sampling_profiler():
+    # POST starts sampling, DELETE stops it and returns the collapsed stacks
+    if not current_app.config['PROFILER_ENABLED']:
+        return jsonify({'error': 'Profiler is disabled'}), 404
+    if request.method == 'POST':
+        interval = request.args.get('interval', type=float)
+        if not profiler.start(interval):
+            return jsonify({'error': 'Profiler is already running'}), 409
+        return jsonify({'running': True, 'interval': profiler.interval}), 202
+    if request.method == 'DELETE':
+        return Response(profiler.stop(), mimetype='text/plain')
+    return jsonify({'running': profiler.running, 'interval': profiler.interval, 'samples': profiler.samples})
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # Development server only; production runs wsgi:app under gunicorn
+    app = create_app()
+    app.run(host=app.config['API_HOST'], port=app.config['API_PORT'], debug=env_bool('FLASK_DEBUG', True))
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 0.10
+
+Exits with status 1 when any benchmark's median latency grew by more than
+the threshold (a fraction, 0.10 = 10%).
+"""
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+    print(f"baseline {baseline['meta'].get('revision')}  candidate {candidate['meta'].get('revision')}")
+    if baseline['meta'].get('cache_type') != candidate['meta'].get('cache_type'):
+        print(f"warning: cache types differ ({baseline['meta'].get('cache_type')} vs "
+              f"{candidate['meta'].get('cache_type')}); API timings are not comparable")
+
+    regressions = []
+    for name, new in candidate['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            print(f'{name:40} (new)')
+            continue
+        change = (new['p50_ms'] - old['p50_ms']) / old['p50_ms'] if old['p50_ms'] else 0.0
+        throughput = (new['ops_per_sec'] - old['ops_per_sec']) / old['ops_per_sec'] if old['ops_per_sec'] else 0.0
+        flag = ''
+        if change > args.threshold:
+            flag = 'REGRESSION'
+            regressions.append(name)
+        print(f"{name:40} p50 {old['p50_ms']:9.4f} -> {new['p50_ms']:9.4f} ms ({change:+7.1%})  "
+              f"throughput {throughput:+7.1%}  {flag}")
+
+    if regressions:
+        print(f'{len(regressions)} regression(s) above {args.threshold:.0%}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Benchmark the API endpoints and VoiceAI.
+
+Run from backend/:
+
+    python -m benchmarks.run --events 100000 --output results.json
+    python -m benchmarks.run --url http://localhost:5000 --concurrency 16
+    python -m benchmarks.compare baseline.json results.json
+
+By default the app runs in-process against a SQLite database seeded with
+--events deterministic events (reused between runs when the row count
+matches). --database points at another database, e.g. a local MySQL, and
+--url load-tests a running server instead of the in-process app.
+The in-process app runs without the response cache unless --cache-type
+says otherwise, so repeated URLs time the handlers rather than cache hits.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from benchmarks.seed import generate_events
+from benchmarks.transcripts import generate as generate_transcripts
+
+EXTRACTORS = ['_extract_title', '_extract_date', '_extract_time', '_extract_duration',
+              '_extract_category', '_extract_priority', '_extract_location', '_extract_participants',
+              '_calculate_confidence']
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+
+def summarize(samples, elapsed, errors=0):
+    samples = sorted(samples)
+    return {
+        'n': len(samples),
+        'errors': errors,
+        'mean_ms': sum(samples) / len(samples) * 1000,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p90_ms': percentile(samples, 90) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'max_ms': samples[-1] * 1000,
+        'ops_per_sec': len(samples) / elapsed if elapsed else 0.0
+    }
+
+def measure(fn, iterations, concurrency=1, warmup=10):
+    """Time fn(i) for i in range(iterations); fn returns False on error."""
+    for i in range(min(warmup, iterations)):
+        fn(i)
+
+    def timed(i):
+        started = time.perf_counter()
+        ok = fn(i)
+        return time.perf_counter() - started, ok is not False
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        results = [timed(i) for i in range(iterations)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(timed, range(iterations)))
+    elapsed = time.perf_counter() - started
+    return summarize([duration for duration, _ in results], elapsed,
+                     errors=sum(1 for _, ok in results if not ok))
+
+def endpoint_requests(transcripts):
+    # Each request varies with i so read paths are not served from one
+    # repeated range; dates fall inside the seeded 2024-2025 window.
+    def month(i):
+        return f'2024-{i % 12 + 1:02d}'
+
+    def day(i):
+        return f'{month(i)}-{i % 28 + 1:02d}'
+
+    return {
+        'GET /api/events (month)': lambda i: ('GET', f'/api/events?from={month(i)}-01&to={month(i)}-28', None),
+        'GET /api/events (week)': lambda i: ('GET', f'/api/events?from={day(i)}&to={month(i)}-{min(i % 28 + 7, 28):02d}', None),
+        'GET /api/events (page)': lambda i: ('GET', '/api/events?limit=500', None),
+        'GET /api/analytics': lambda i: ('GET', '/api/analytics', None),
+        'GET /api/analytics/insights': lambda i: ('GET', f'/api/analytics/insights?to={month(i)}-28', None),
+        'GET /api/events/summary (month)': lambda i: ('GET', f'/api/events/summary?from={month(i)}-01&to={month(i)}-28', None),
+        'GET /api/events/conflicts (day)': lambda i: ('GET', f'/api/events/conflicts?from={day(i)}&to={day(i)}', None),
+        'GET /api/slots/free': lambda i: ('GET', f'/api/slots/free?date={day(i)}&duration=30', None),
+        'POST /api/ai/process-voice': lambda i: ('POST', '/api/ai/process-voice',
+                                                 {'transcript': transcripts[i % len(transcripts)]}),
+    }
+
+def in_process_caller(app):
+    local = threading.local()
+
+    def call(method, path, body):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        response = local.client.open(path, method=method, json=body)
+        response.get_data()
+        return response.status_code < 400
+    return call
+
+def http_caller(base_url):
+    def call(method, path, body):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(base_url.rstrip('/') + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status < 400
+        except OSError:
+            return False
+    return call
+
+def build_app(database, events, seed, cache_type='null'):
+    from app import create_app, import_events
+    from models import Event
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database, 'AUTO_CREATE_TABLES': True, 'CACHE_TYPE': cache_type})
+    with app.app_context():
+        existing = Event.query.count()
+        if existing == events:
+            return app, None
+        if existing:
+            sys.exit(f'{database} holds {existing} events, expected {events}; use a fresh database')
+        report = import_events(generate_events(events, seed), chunk_size=5000)
+    return app, report
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def bench_voice(transcripts):
+    from voice_ai import VoiceAI
+
+    voice_ai = VoiceAI(workers=1, cache_size=0)
+    results = {
+        'voice.process_voice_command': measure(lambda i: voice_ai.process_safe(transcripts[i % len(transcripts)])['success'],
+                                               len(transcripts))
+    }
+    # Same transcripts again through a warm result cache
+    cached = VoiceAI(workers=1, cache_size=len(transcripts))
+    for transcript in transcripts:
+        cached.process_safe(transcript)
+    results['voice.process_voice_command.cached'] = measure(
+        lambda i: cached.process_safe(transcripts[i % len(transcripts)])['success'], len(transcripts))
+    lowered = [t.lower().strip() for t in transcripts]
+    hits = [voice_ai._scan(t) for t in lowered]
+    results['voice._scan'] = measure(lambda i: voice_ai._scan(lowered[i]), len(lowered))
+    for name in EXTRACTORS:
+        extractor = getattr(voice_ai, name)
+        results[f'voice.{name}'] = measure(lambda i: extractor(lowered[i], hits[i]), len(lowered))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=1000, help='events to seed (e.g. 1000, 100000, 1000000)')
+    parser.add_argument('--database', help='SQLAlchemy URL; defaults to a SQLite file in the temp directory')
+    parser.add_argument('--url', help='benchmark a running server instead of the in-process app')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=1, help='concurrent clients per endpoint')
+    parser.add_argument('--transcripts', type=int, default=2000, help='synthetic transcripts for VoiceAI')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cache-type', default='null', choices=['null', 'simple', 'filesystem', 'redis'],
+                        help='response cache of the in-process app; null times the uncached handlers')
+    parser.add_argument('--only', choices=['api', 'voice'], help='run one half of the suite')
+    parser.add_argument('--output', help='write JSON results here (default: stdout)')
+    args = parser.parse_args(argv)
+
+    transcripts = generate_transcripts(args.transcripts, args.seed)
+    meta = {
+        'revision': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'events': args.events,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'transcripts': args.transcripts,
+        'seed': args.seed
+    }
+    results = {}
+
+    if args.only != 'voice':
+        if args.url:
+            call = http_caller(args.url)
+            meta['target'] = args.url
+        else:
+            database = args.database or 'sqlite:///' + os.path.join(
+                tempfile.gettempdir(), f'planifyai-bench-{args.events}-{args.seed}.db')
+            app, report = build_app(database, args.events, args.seed, args.cache_type)
+            if report:
+                meta['seed_rows_per_sec'] = report['rowsPerSecond']
+            call = in_process_caller(app)
+            meta['target'] = database
+            meta['cache_type'] = args.cache_type
+        for name, make_request in endpoint_requests(transcripts).items():
+            results[name] = measure(lambda i: call(*make_request(i)), args.requests, args.concurrency)
+            print(f"{name:40} p50 {results[name]['p50_ms']:8.3f} ms  p99 {results[name]['p99_ms']:8.3f} ms  "
+                  f"{results[name]['ops_per_sec']:10.1f} req/s", file=sys.stderr)
+
+    if args.only != 'api':
+        for name, result in bench_voice(transcripts).items():
+            results[name] = result
+            print(f"{name:40} p50 {result['p50_ms'] * 1000:8.1f} us  {result['ops_per_sec']:10.0f} ops/s",
+                  file=sys.stderr)
+
+    output = json.dumps({'meta': meta, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    main()
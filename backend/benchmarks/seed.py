@@ -0,0 +1,25 @@
+import random
+from datetime import date, timedelta
+
+from voice_ai import CATEGORY_KEYWORDS
+
+def generate_events(count, seed=0, start=date(2024, 1, 1), days=730):
+    """Deterministic event payloads spread over days, including a few recurring series."""
+    rng = random.Random(seed)
+    categories = list(CATEGORY_KEYWORDS) + ['general']
+    for i in range(count):
+        start_minute = rng.randrange(6 * 60, 21 * 60, 15)
+        end_minute = min(start_minute + rng.choice([15, 30, 45, 60, 90, 120]), 23 * 60 + 59)
+        event = {
+            'title': f'Event {i}',
+            'description': '',
+            'date': (start + timedelta(days=rng.randrange(days))).isoformat(),
+            'startTime': f'{start_minute // 60:02d}:{start_minute % 60:02d}',
+            'endTime': f'{end_minute // 60:02d}:{end_minute % 60:02d}',
+            'category': rng.choice(categories),
+            'priority': rng.choice(['low', 'medium', 'high'])
+        }
+        if i % 500 == 0:
+            event['isRecurring'] = True
+            event['recurringPattern'] = rng.choice(['FREQ=DAILY', 'FREQ=WEEKLY;BYDAY=MO,WE,FR', 'FREQ=MONTHLY'])
+        yield event
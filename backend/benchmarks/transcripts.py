@@ -0,0 +1,45 @@
+import random
+
+from voice_ai import (CATEGORY_KEYWORDS, COMMAND_WORDS, COMMON_LOCATIONS, HIGH_PRIORITY,
+                      LOW_PRIORITY, MONTHS, ONLINE_WORDS, TIME_KEYWORDS, WEEKDAYS)
+
+NAMES = ['john', 'sarah', 'ahmed', 'maria', 'li wei', 'the design team']
+
+def _date_phrase(rng):
+    choice = rng.random()
+    if choice < 0.3:
+        return rng.choice(['today', 'tomorrow', 'next week'])
+    if choice < 0.6:
+        return rng.choice(['', 'next ']) + rng.choice(WEEKDAYS)
+    if choice < 0.8:
+        return f'{rng.randint(1, 28)} {rng.choice(MONTHS)}'
+    return ''
+
+def _time_phrase(rng):
+    choice = rng.random()
+    if choice < 0.4:
+        return f'at {rng.randint(1, 12)} {rng.choice(["am", "pm"])}'
+    if choice < 0.6:
+        return f'at {rng.randint(1, 12)}:{rng.choice(["00", "15", "30", "45"])} {rng.choice(["am", "pm"])}'
+    if choice < 0.8:
+        return rng.choice(list(TIME_KEYWORDS))
+    return ''
+
+def generate(count, seed=0):
+    """Deterministic voice commands built from the VoiceAI keyword tables."""
+    rng = random.Random(seed)
+    keywords = [word for words in CATEGORY_KEYWORDS.values() for word in words]
+    transcripts = []
+    for _ in range(count):
+        parts = [rng.choice(COMMAND_WORDS), rng.choice(keywords)]
+        if rng.random() < 0.4:
+            parts.append('with ' + rng.choice(NAMES))
+        parts += [_date_phrase(rng), _time_phrase(rng)]
+        if rng.random() < 0.3:
+            parts.append(f'for {rng.randint(15, 120)} minutes')
+        if rng.random() < 0.3:
+            parts.append('in ' + rng.choice(COMMON_LOCATIONS + ONLINE_WORDS))
+        if rng.random() < 0.2:
+            parts.append(rng.choice(HIGH_PRIORITY + LOW_PRIORITY))
+        transcripts.append(' '.join(part for part in parts if part))
+    return transcripts
@@ -0,0 +1,83 @@
+import os
+import tempfile
+from urllib.parse import quote_plus
+
+def env_bool(name, default):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes', 'on')
+
+def database_uri():
+    url = os.environ.get('DATABASE_URL')
+    if url:
+        # A bare mysql:// URL means the PyMySQL driver from requirements.txt
+        if url.startswith('mysql://'):
+            url = 'mysql+pymysql://' + url[len('mysql://'):]
+        return url
+    return 'mysql+pymysql://{}:{}@{}:{}/{}'.format(
+        quote_plus(os.environ.get('DB_USER', 'root')),
+        quote_plus(os.environ.get('DB_PASSWORD', '')),
+        os.environ.get('DB_HOST', 'localhost'),
+        os.environ.get('DB_PORT', '3306'),
+        os.environ.get('DB_NAME', 'planifyai')
+    )
+
+def engine_options(uri):
+    if uri.startswith('sqlite'):
+        return {}
+    # Every worker process owns one pool. pool_size should cover its request
+    # threads; workers * (pool_size + max_overflow) must stay below the
+    # server's max_connections.
+    return {
+        'pool_size': int(os.environ.get('DATABASE_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DATABASE_MAX_OVERFLOW', 5)),
+        'pool_timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DATABASE_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True
+    }
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'dev')
+    DEBUG = env_bool('FLASK_DEBUG', False)
+
+    # SQLALCHEMY_ENGINE_OPTIONS is derived from the final URI in create_app()
+    SQLALCHEMY_DATABASE_URI = database_uri()
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Production schemas come from database/setup.sql
+    AUTO_CREATE_TABLES = env_bool('AUTO_CREATE_TABLES', True)
+
+    API_HOST = os.environ.get('API_HOST', '127.0.0.1')
+    API_PORT = int(os.environ.get('API_PORT', 5000))
+    CORS_ORIGINS = [origin.strip() for origin in os.environ.get('CORS_ORIGINS', '*').split(',')]
+
+    MAX_EVENTS_PER_REQUEST = int(os.environ.get('MAX_EVENTS_PER_REQUEST', 1000))
+    # Longest from/to window recurring series are expanded over
+    MAX_RANGE_DAYS = int(os.environ.get('MAX_RANGE_DAYS', 731))
+    VOICE_BATCH_WORKERS = int(os.environ.get('VOICE_BATCH_WORKERS') or 0)
+    # Recent VoiceAI parse results kept per process; 0 disables
+    VOICE_CACHE_SIZE = int(os.environ.get('VOICE_CACHE_SIZE', 1024))
+    # Async voice jobs: parses at or above the threshold are saved as events,
+    # the rest are kept in ai_insights as suggestions
+    AI_CONFIDENCE_THRESHOLD = float(os.environ.get('AI_CONFIDENCE_THRESHOLD', 0.7))
+    # Also record auto-saved parses in ai_insights
+    AI_LEARNING_ENABLED = env_bool('AI_LEARNING_ENABLED', True)
+    VOICE_JOB_WORKERS = int(os.environ.get('VOICE_JOB_WORKERS', 2))
+    VOICE_JOB_QUEUE_SIZE = int(os.environ.get('VOICE_JOB_QUEUE_SIZE', 100))
+    VOICE_JOB_MAX_WAIT = float(os.environ.get('VOICE_JOB_MAX_WAIT', 25))
+    VOICE_JOB_RETENTION_HOURS = int(os.environ.get('VOICE_JOB_RETENTION_HOURS', 24))
+    # In-memory columnar copy of the events table behind /api/analytics/insights
+    # and /api/events/summary, loaded on first use
+    EVENT_STORE_ENABLED = env_bool('EVENT_STORE_ENABLED', True)
+
+    # null, simple (in-process, one worker only), filesystem (shared by the
+    # workers on one host) or redis
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'simple')
+    CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 300))
+    CACHE_THRESHOLD = int(os.environ.get('CACHE_THRESHOLD', 500))
+    CACHE_DIR = os.environ.get('CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'planifyai-cache')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    METRICS_ENABLED = env_bool('METRICS_ENABLED', True)
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'WARNING')
+    LOG_FILE = os.environ.get('LOG_FILE')
+    # Exposes /debug/profiler; keep off where the API is reachable publicly
+    PROFILER_ENABLED = env_bool('PROFILER_ENABLED', False)
@@ -0,0 +1,209 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime, timezone
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python 3.8
+    ZoneInfo = None
+
+FORMATS = ('csv', 'ics', 'ndjson')
+FIELDS = ['title', 'description', 'date', 'startTime', 'endTime', 'category', 'priority',
+          'isRecurring', 'recurringPattern']
+
+ICS_PRIORITY = {'high': 1, 'medium': 5, 'low': 9}
+
+def format_from_filename(filename):
+    ext = os.path.splitext(filename)[1].lower().lstrip('.')
+    if ext in ('jsonl', 'json'):
+        return 'ndjson'
+    return ext if ext in FORMATS else None
+
+def read_events(lines, fmt):
+    """Yield event payloads (the same shape the API accepts) from lines of text."""
+    if fmt == 'csv':
+        return _read_csv(lines)
+    if fmt == 'ics':
+        return _read_ics(lines)
+    if fmt == 'ndjson':
+        return _read_ndjson(lines)
+    raise ValueError(f'Unsupported format: {fmt}')
+
+def write_events(events, fmt):
+    """Yield text chunks for an iterable of event payloads."""
+    if fmt == 'csv':
+        return _write_csv(events)
+    if fmt == 'ics':
+        return _write_ics(events)
+    if fmt == 'ndjson':
+        return (json.dumps(event) + '\n' for event in events)
+    raise ValueError(f'Unsupported format: {fmt}')
+
+def _read_ndjson(lines):
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+def _read_csv(lines):
+    for row in csv.DictReader(lines):
+        yield {key: value for key, value in row.items() if key in FIELDS}
+
+def _write_csv(events):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['id'] + FIELDS)
+    for event in events:
+        writer.writerow([event.get('id')] + [event.get(field) for field in FIELDS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def _unfold(lines):
+    # RFC 5545 content lines continue onto lines starting with a space or tab
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def _ics_unescape(value):
+    return (value.replace('\\n', '\n').replace('\\N', '\n')
+            .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\'))
+
+def _ics_escape(value):
+    return (value.replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+def _ics_zone(tzid):
+    if ZoneInfo is None:
+        raise ValueError(f'TZID {tzid} needs Python 3.9+')
+    try:
+        return ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f'Unknown TZID {tzid}')
+
+def _ics_datetime(value, tzid=None):
+    # 20240115T093000[Z] or, for all-day events, 20240115. Events are stored
+    # as wall-clock times, so UTC and TZID times are converted to the
+    # server's local time zone.
+    if 'T' not in value:
+        return f'{value[0:4]}-{value[4:6]}-{value[6:8]}', None
+    try:
+        moment = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    except ValueError:
+        raise ValueError(f'Invalid date-time {value!r}')
+    if value.endswith('Z'):
+        moment = moment.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    elif tzid:
+        moment = moment.replace(tzinfo=_ics_zone(tzid)).astimezone().replace(tzinfo=None)
+    return moment.strftime('%Y-%m-%d'), moment.strftime('%H:%M')
+
+def _ics_params(name):
+    params = {}
+    for param in name.split(';')[1:]:
+        key, _, value = param.partition('=')
+        params[key.upper()] = value.strip('"')
+    return params
+
+def _ics_priority(value):
+    level = int(value) if value.isdigit() else 0
+    if 1 <= level <= 4:
+        return 'high'
+    if level >= 6:
+        return 'low'
+    return 'medium'
+
+def _ics_rule(value):
+    # WKST only changes which weekly occurrences INTERVAL>1 with BYDAY skips
+    # when the week starts on another day; Outlook always emits WKST=MO
+    return ';'.join(part for part in value.split(';') if part and not part.upper().startswith('WKST='))
+
+def _read_ics(lines):
+    event = None
+    row = 0
+    for line in _unfold(lines):
+        if line == 'BEGIN:VEVENT':
+            event = {}
+            row += 1
+            continue
+        if event is None:
+            continue
+        if line == 'END:VEVENT':
+            if 'DTSTART' not in event:
+                raise ValueError(f'Row {row}: VEVENT without DTSTART')
+            # Recurrence is kept as one RRULE-style pattern with EXDATE folded in
+            pattern = event.get('RRULE')
+            if pattern and event.get('EXDATE'):
+                pattern += ';EXDATE=' + ','.join(event['EXDATE'])
+            yield {
+                'title': event.get('SUMMARY', 'Untitled'),
+                'description': event.get('DESCRIPTION', ''),
+                'date': event['DTSTART'][0],
+                'startTime': event['DTSTART'][1] or '00:00',
+                'endTime': event.get('DTEND', (None, None))[1] or '23:59',
+                'category': event.get('CATEGORIES', 'general').split(',')[0].lower() or 'general',
+                'priority': _ics_priority(event.get('PRIORITY', '')),
+                'isRecurring': bool(pattern),
+                'recurringPattern': pattern
+            }
+            event = None
+            continue
+        name, _, value = line.partition(':')
+        params = _ics_params(name)
+        name = name.split(';')[0].upper()
+        if name in ('DTSTART', 'DTEND'):
+            try:
+                event[name] = _ics_datetime(value, params.get('TZID'))
+            except ValueError as e:
+                raise ValueError(f'Row {row}: {name} {e}')
+        elif name in ('SUMMARY', 'DESCRIPTION', 'CATEGORIES'):
+            event[name] = _ics_unescape(value)
+        elif name == 'PRIORITY':
+            event[name] = value
+        elif name == 'RRULE':
+            event[name] = _ics_rule(value)
+        elif name == 'EXDATE':
+            event.setdefault(name, []).extend(value.split(','))
+
+def _fold(line):
+    # Keep content lines within the 75 character limit
+    chunks = [line[i:i + 74] for i in range(0, len(line), 74)] or ['']
+    return '\r\n '.join(chunks) + '\r\n'
+
+def _write_ics(events):
+    yield 'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//PlanifyAI//Calendar//EN\r\n'
+    for event in events:
+        day = event['date'].replace('-', '')
+        lines = [
+            'BEGIN:VEVENT',
+            f"UID:planifyai-{event.get('id')}@planifyai",
+            f"DTSTART:{day}T{event['startTime'].replace(':', '')}00",
+            f"DTEND:{day}T{event['endTime'].replace(':', '')}00",
+            f"SUMMARY:{_ics_escape(event['title'])}",
+        ]
+        if event.get('description'):
+            lines.append(f"DESCRIPTION:{_ics_escape(event['description'])}")
+        lines.append(f"CATEGORIES:{_ics_escape(event.get('category') or 'general')}")
+        lines.append(f"PRIORITY:{ICS_PRIORITY.get(event.get('priority'), 5)}")
+        if event.get('isRecurring') and event.get('recurringPattern'):
+            pattern = event['recurringPattern']
+            if pattern.upper().startswith('RRULE:'):
+                pattern = pattern[6:]
+            rule = [part for part in pattern.split(';') if part]
+            exdates = [part.partition('=')[2] for part in rule if part.upper().startswith('EXDATE=')]
+            rule = [part for part in rule if not part.upper().startswith('EXDATE=')]
+            lines.append('RRULE:' + ';'.join(rule))
+            for value in exdates:
+                lines.append('EXDATE;VALUE=DATE:' + value.replace('-', ''))
+        lines.append('END:VEVENT')
+        yield ''.join(_fold(line) for line in lines)
+    yield 'END:VCALENDAR\r\n'
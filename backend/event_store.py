@@ -0,0 +1,184 @@
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date as Date
+from functools import lru_cache
+from itertools import repeat
+from operator import add
+
+from interval_index import to_minutes, to_time
+
+# Times repeat heavily across rows, so parsing them once each pays off on load
+_minutes = lru_cache(maxsize=4096)(to_minutes)
+
+class Dictionary:
+    """Dictionary encoding: each distinct value is stored once, rows keep a small int code."""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def encode(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+class EventStore:
+    """Read-side copy of the events table held in array-backed columns.
+
+    Rows are sorted by (day, start, id) so a date range is a bisect away.
+    Dates are day ordinals, times are minutes after midnight (-1 when
+    malformed), and category and priority are dictionary-encoded. Titles are
+    kept for rendering and descriptions are not kept. Recurring series are
+    kept as their stored row, as in the aggregate tables.
+    """
+
+    def __init__(self):
+        self.ids = array('i')
+        self.days = array('i')
+        self.starts = array('h')
+        self.ends = array('h')
+        # Same value as app.event_minutes, precomputed for the aggregates
+        self.minutes = array('h')
+        self.categories = array('H')
+        self.priorities = array('B')
+        self.recurring = array('B')
+        self.titles = []
+        self.category_names = Dictionary()
+        self.priority_names = Dictionary()
+        # Day ordinal per event id (0 = not stored); ids are dense
+        # auto-increment values, so this locates a row's day in O(1)
+        self._day_of = array('i')
+        self.sync_token = 0
+        self.loaded = False
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _columns(self):
+        return (self.ids, self.days, self.starts, self.ends, self.minutes,
+                self.categories, self.priorities, self.recurring, self.titles)
+
+    def _encode(self, event_id, date, start_time, end_time, category, priority, is_recurring, title):
+        start, end = _minutes(start_time), _minutes(end_time)
+        if start is None or end is None:
+            start = end = -1
+        return (event_id, date.toordinal(), start, end, max(end - start, 0),
+                self.category_names.encode(category or 'general'),
+                self.priority_names.encode(priority or 'medium'), int(bool(is_recurring)), title)
+
+    def clear(self):
+        for column in self._columns():
+            del column[:]
+        del self._day_of[:]
+        self.sync_token = 0
+        self.loaded = False
+
+    def load(self, rows):
+        """Replace the contents with rows of (id, date, start_time, end_time, category, priority, is_recurring, title)."""
+        self.clear()
+        encoded = sorted((self._encode(*row) for row in rows), key=lambda r: (r[1], r[2], r[0]))
+        for column, values in zip(self._columns(), zip(*encoded)):
+            column.extend(values)
+        self._day_of = array('i', bytes(4 * (max(self.ids, default=0) + 1)))
+        for event_id, day in zip(self.ids, self.days):
+            self._day_of[event_id] = day
+
+    def add(self, event_id, date, start_time, end_time, category, priority, is_recurring, title):
+        self.remove(event_id)
+        row = self._encode(event_id, date, start_time, end_time, category, priority, is_recurring, title)
+        day, start = row[1], row[2]
+        position = bisect_left(self.days, day)
+        end = bisect_right(self.days, day, position)
+        while position < end and (self.starts[position], self.ids[position]) < (start, event_id):
+            position += 1
+        for column, value in zip(self._columns(), row):
+            column.insert(position, value)
+        if event_id >= len(self._day_of):
+            self._day_of.extend(repeat(0, event_id + 1 - len(self._day_of)))
+        self._day_of[event_id] = day
+
+    def remove(self, event_id):
+        day = self._day_of[event_id] if event_id < len(self._day_of) else 0
+        if not day:
+            return
+        lo = bisect_left(self.days, day)
+        position = lo + self.ids[lo:bisect_right(self.days, day, lo)].index(event_id)
+        for column in self._columns():
+            del column[position]
+        self._day_of[event_id] = 0
+
+    def _bounds(self, date_from, date_to):
+        lo = bisect_left(self.days, date_from.toordinal()) if date_from else 0
+        hi = bisect_right(self.days, date_to.toordinal()) if date_to else len(self.days)
+        return lo, max(lo, hi)
+
+    def rows(self, date_from=None, date_to=None):
+        """Yield compact dicts for the events in the range, in (date, startTime, id) order."""
+        lo, hi = self._bounds(date_from, date_to)
+        categories, priorities = self.category_names.values, self.priority_names.values
+        for event_id, day, start, end, category, priority, recurring, title in zip(
+                self.ids[lo:hi], self.days[lo:hi], self.starts[lo:hi], self.ends[lo:hi],
+                self.categories[lo:hi], self.priorities[lo:hi], self.recurring[lo:hi], self.titles[lo:hi]):
+            yield {
+                'id': event_id,
+                'title': title,
+                'date': Date.fromordinal(day).isoformat(),
+                'startTime': to_time(start) if start >= 0 else None,
+                'endTime': to_time(end) if end >= 0 else None,
+                'category': categories[category],
+                'priority': priorities[priority],
+                'isRecurring': bool(recurring)
+            }
+
+    def category_totals(self, date_from=None, date_to=None):
+        """{category: (events, minutes)} over the range."""
+        lo, hi = self._bounds(date_from, date_to)
+        counts = [0] * len(self.category_names.values)
+        minutes = [0] * len(self.category_names.values)
+        for category, duration in zip(self.categories[lo:hi], self.minutes[lo:hi]):
+            counts[category] += 1
+            minutes[category] += duration
+        return {name: (counts[code], minutes[code])
+                for code, name in enumerate(self.category_names.values) if counts[code]}
+
+    def hourly_load(self, date_from=None, date_to=None):
+        """Events starting in, and busy minutes falling in, each hour of the day."""
+        lo, hi = self._bounds(date_from, date_to)
+        starts = self.starts[lo:hi]
+        # Events covering each minute of the day, from the counts of busy
+        # periods opening and closing there (malformed rows open and close at -1)
+        opened = Counter(starts)
+        closed = Counter(map(add, starts, self.minutes[lo:hi]))
+        events = [0] * 24
+        minutes = [0] * 24
+        covering = 0
+        for minute in range(24 * 60):
+            covering += opened.get(minute, 0) - closed.get(minute, 0)
+            events[minute // 60] += opened.get(minute, 0)
+            minutes[minute // 60] += covering
+        return events, minutes
+
+    def weekly_load(self, date_from, date_to):
+        """[(monday, events, minutes)] for every week overlapping the range."""
+        first, last = date_from.toordinal(), date_to.toordinal()
+        monday = first - date_from.weekday()
+        weeks = []
+        # Rows are sorted by day, so each week is one contiguous slice
+        lo = bisect_left(self.days, first)
+        while monday <= last:
+            hi = bisect_right(self.days, min(monday + 6, last), lo)
+            weeks.append((Date.fromordinal(monday), hi - lo, sum(self.minutes[lo:hi])))
+            lo = hi
+            monday += 7
+        return weeks
+
+    def memory_bytes(self):
+        arrays = sum(column.itemsize * len(column) for column in self._columns()[:-1] + (self._day_of,))
+        titles = sys.getsizeof(self.titles) + sum(sys.getsizeof(title) for title in self.titles)
+        return arrays + titles
@@ -0,0 +1,54 @@
+# Production server settings: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Worker model: several processes, each with a few threads. Processes give
+# CPU parallelism (voice parsing holds the GIL); threads let one process
+# overlap requests that wait on MySQL. Each process has its own SQLAlchemy
+# pool, so keep DATABASE_POOL_SIZE >= GUNICORN_THREADS and
+# WEB_CONCURRENCY * (DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW) below
+# MySQL's max_connections (151 by default).
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('API_HOST', '0.0.0.0')}:{os.environ.get('API_PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# On SIGTERM workers stop accepting connections and get graceful_timeout
+# seconds to finish in-flight requests
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+
+# The schema is managed by database/setup.sql; concurrent create_all() from
+# every worker would race. Batch voice parsing shares the cores with the web
+# workers, so it gets a small pool per worker. The in-process response cache
+# cannot see other workers' writes, so workers share a filesystem cache.
+os.environ.setdefault('AUTO_CREATE_TABLES', 'false')
+os.environ.setdefault('VOICE_BATCH_WORKERS', '2')
+os.environ.setdefault('CACHE_TYPE', 'filesystem')
+
+def post_worker_init(worker):
+    # gunicorn has no hook for SIGTERM itself, so chain the worker's handler:
+    # readiness fails as soon as the worker starts draining
+    import signal
+    from app import drain
+    from wsgi import app
+
+    handle_exit = worker.handle_exit
+
+    def on_sigterm(sig, frame):
+        drain(app)
+        handle_exit(sig, frame)
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+def worker_exit(server, worker):
+    from app import shutdown
+    from wsgi import app
+    shutdown(app)
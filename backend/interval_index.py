@@ -0,0 +1,166 @@
+import threading
+from bisect import bisect_left, insort
+
+from recurrence import occurrences, parse_rule
+
+MINUTES_PER_DAY = 24 * 60
+
+def to_minutes(value):
+    """Parse 'HH:MM' into minutes after midnight, or None if malformed."""
+    try:
+        hour, minute = value.split(':')
+        hour, minute = int(hour), int(minute)
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return None
+    return hour * 60 + minute
+
+def to_time(minutes):
+    minutes %= MINUTES_PER_DAY
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+class IntervalIndex:
+    """Per-day sorted arrays of (start, end, event_id) in minutes.
+
+    Events are partitioned by date and kept sorted by start, so overlap
+    queries only look at one day, and within it only at entries whose start
+    lies between (query start - longest event of the day) and query end.
+    Recurring series are kept apart and expanded into the day being queried.
+    """
+
+    def __init__(self):
+        self._days = {}
+        self._events = {}
+        self._longest = {}
+        # series id -> (first date, start, end, rule)
+        self._series = {}
+        self.sync_token = 0
+        self.loaded = False
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._events) + len(self._series)
+
+    def clear(self):
+        self._days.clear()
+        self._events.clear()
+        self._longest.clear()
+        self._series.clear()
+        self.sync_token = 0
+        self.loaded = False
+
+    def add(self, event_id, date, start_time, end_time, is_recurring=False, pattern=None):
+        self.remove(event_id)
+        start, end = to_minutes(start_time), to_minutes(end_time)
+        if start is None or end is None:
+            return
+        if end < start:
+            # Runs past midnight; only the part on its own date is indexed
+            end = MINUTES_PER_DAY
+        if is_recurring:
+            try:
+                self._series[event_id] = (date, start, end, parse_rule(pattern))
+                return
+            except ValueError:
+                pass  # A malformed stored rule degrades to a one-off event
+        entry = (start, end, event_id)
+        insort(self._days.setdefault(date, []), entry)
+        self._events[event_id] = (date, entry)
+        self._longest[date] = max(self._longest.get(date, 0), end - start)
+
+    def remove(self, event_id):
+        if self._series.pop(event_id, None) is not None:
+            return
+        found = self._events.pop(event_id, None)
+        if found is None:
+            return
+        date, entry = found
+        day = self._days[date]
+        del day[bisect_left(day, entry)]
+        if not day:
+            del self._days[date]
+            del self._longest[date]
+
+    def _day(self, date):
+        """Sorted (start, end, id) entries on date, series occurrences included, and the longest."""
+        day = self._days.get(date, [])
+        longest = self._longest.get(date, 0)
+        extra = [(start, end, series_id) for series_id, (first, start, end, rule) in self._series.items()
+                 if first <= date and any(occurrences(rule, first, date, date))]
+        if extra:
+            day = sorted(day + extra)
+            longest = max([longest] + [end - start for start, end, _ in extra])
+        return day, longest
+
+    def _series_dates(self, date_from, date_to):
+        for first, _, _, rule in self._series.values():
+            yield from occurrences(rule, first, date_from or first, date_to)
+
+    def overlapping(self, date, start, end, exclude=None):
+        """Ids of events on date overlapping [start, end) minutes."""
+        day, longest = self._day(date)
+        if not day or end <= start:
+            return []
+        lo = bisect_left(day, (start - longest,))
+        hi = bisect_left(day, (end,))
+        return [event_id for s, e, event_id in day[lo:hi]
+                if e > start and s < e and event_id != exclude]
+
+    def conflicts(self, date_from=None, date_to=None):
+        """Yield (date, first_id, second_id) for every overlapping pair.
+
+        Without date_to, series are expanded up to the last date holding a
+        one-off event or a series start.
+        """
+        dates = set(self._days)
+        if self._series:
+            last = date_to or max(dates | {first for first, _, _, _ in self._series.values()})
+            dates.update(self._series_dates(date_from, last))
+        for date in sorted(dates):
+            if (date_from and date < date_from) or (date_to and date > date_to):
+                continue
+            active = []
+            for start, end, event_id in self._day(date)[0]:
+                if end <= start:
+                    continue
+                active = [(e, other) for e, other in active if e > start]
+                for _, other in active:
+                    yield date, other, event_id
+                active.append((end, event_id))
+
+    def busy(self, date):
+        """Merged busy intervals for a day, in order."""
+        merged = []
+        for start, end, _ in self._day(date)[0]:
+            if end <= start:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return merged
+
+    def free_slots(self, date, duration, day_start=0, day_end=MINUTES_PER_DAY):
+        """Free [start, end) gaps of at least duration minutes within the day window."""
+        slots = []
+        cursor = day_start
+        for start, end in self.busy(date):
+            gap_end = min(start, day_end)
+            if gap_end - cursor >= duration:
+                slots.append((cursor, gap_end))
+            cursor = max(cursor, end)
+            if cursor >= day_end:
+                return slots
+        if day_end - cursor >= duration:
+            slots.append((cursor, day_end))
+        return slots
+
+    def nearest_free_slot(self, date, start, duration, day_start=0, day_end=MINUTES_PER_DAY):
+        """Start minute of the free slot closest to start, or None."""
+        best = None
+        for slot_start, slot_end in self.free_slots(date, duration, day_start, day_end):
+            candidate = min(max(start, slot_start), slot_end - duration)
+            if best is None or abs(candidate - start) < abs(best - start):
+                best = candidate
+        return best
@@ -0,0 +1,192 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+EXTRACTOR_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.001)
+
+sql_logger = logging.getLogger('planifyai.sql')
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f'{self.name}{_labels(self.labelnames, labels)} {value}'
+
+class Gauge:
+    """A value set directly, or read from function() at scrape time."""
+    kind = 'gauge'
+
+    def __init__(self, name, help, function=None):
+        self.name = name
+        self.help = help
+        self.function = function
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        yield f'{self.name} {self.function() if self.function else self.value}'
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                bucket_labels = _labels(self.labelnames, labels, 'le="%s"' % bound)
+                yield f'{self.name}_bucket{bucket_labels} {cumulative}'
+            yield f'{self.name}_sum{_labels(self.labelnames, labels)} {total}'
+            yield f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}'
+
+class Metrics:
+    """Process-wide request, query and VoiceAI metrics in Prometheus text format.
+
+    Nothing is hooked up until init_app()/instrument_engine() run, so a
+    disabled instance costs nothing on the request path.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self.requests = self.histogram('planifyai_http_request_duration_seconds',
+                                       'Request latency by route', ('method', 'route', 'status'))
+        self.request_queries = self.histogram('planifyai_http_request_db_queries',
+                                              'Database queries per request', ('route',), QUERY_COUNT_BUCKETS)
+        self.queries = self.histogram('planifyai_db_query_duration_seconds',
+                                      'Database query latency by statement type', ('operation',))
+        self.slow_queries = self.counter('planifyai_db_slow_queries_total',
+                                         'Queries slower than SLOW_QUERY_MS', ('operation',))
+        self.extractors = self.histogram('planifyai_voice_extractor_duration_seconds',
+                                         'Time spent in each VoiceAI extraction step', ('extractor',),
+                                         EXTRACTOR_BUCKETS)
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, function=None):
+        return self._register(Gauge(name, help, function))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    def observe_extractor(self, name, seconds):
+        self.extractors.observe(seconds, name)
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.db_queries = 0
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            # Rule templates keep label cardinality bounded; streamed bodies
+            # are timed up to the first byte.
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            self.requests.observe(time.perf_counter() - started, request.method, route, response.status_code)
+            self.request_queries.observe(g.pop('db_queries', 0), route)
+        return response
+
+    def instrument_engine(self, engine, slow_query_seconds):
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info['query_started'].pop()
+            operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+            self.queries.observe(elapsed, operation)
+            if has_request_context() and 'db_queries' in g:
+                g.db_queries += 1
+            if elapsed >= slow_query_seconds:
+                self.slow_queries.inc(operation)
+                sql_logger.warning('Slow query (%.1f ms): %s', elapsed * 1000, statement)
+            elif sql_logger.isEnabledFor(logging.DEBUG):
+                sql_logger.debug('Query (%.1f ms): %s', elapsed * 1000, statement)
+
+        def handle_error(context):
+            # A failed statement never reaches after_cursor_execute
+            started = context.connection.info.get('query_started') if context.connection else None
+            if started:
+                started.pop()
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+        event.listen(engine, 'handle_error', handle_error)
+
+def configure_logging(level, path=None):
+    """Send the planifyai.* loggers to LOG_FILE (or stderr) at LOG_LEVEL."""
+    logger = logging.getLogger('planifyai')
+    logger.setLevel(level.upper())
+    if not logger.handlers:
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        handler = logging.FileHandler(path) if path else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'))
+        logger.addHandler(handler)
@@ -0,0 +1,96 @@
+from datetime import datetime
+from flask_sqlalchemy import SQLAlchemy
+
+db = SQLAlchemy()
+
+class Event(db.Model):
+    __tablename__ = 'events'
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    date = db.Column(db.Date, nullable=False)
+    start_time = db.Column(db.String(10), nullable=False)
+    end_time = db.Column(db.String(10), nullable=False)
+    category = db.Column(db.String(50), default='general')
+    priority = db.Column(db.Enum('low', 'medium', 'high'), default='medium')
+    is_recurring = db.Column(db.Boolean, default=False)
+    # RRULE subset understood by recurrence.parse_rule
+    recurring_pattern = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (db.Index('idx_events_date_time', 'date', 'start_time'),)
+
+class TimeBlock(db.Model):
+    __tablename__ = 'time_blocks'
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    start_time = db.Column(db.String(10), nullable=False)
+    end_time = db.Column(db.String(10), nullable=False)
+    block_type = db.Column(db.Enum('focus', 'break', 'meeting', 'personal'), default='focus')
+    description = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.Index('idx_time_blocks_date_time', 'date', 'start_time'),)
+
+class AiInsight(db.Model):
+    __tablename__ = 'ai_insights'
+    id = db.Column(db.Integer, primary_key=True)
+    insight_type = db.Column(db.String(50), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    confidence_score = db.Column(db.Float, default=0.0)
+    # JSON document
+    data = db.Column(db.Text)
+    is_applied = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class VoiceJob(db.Model):
+    # Shared view of async voice jobs, so any worker can answer a poll for
+    # a job queued in another one
+    __tablename__ = 'voice_jobs'
+    id = db.Column(db.String(32), primary_key=True)
+    transcript = db.Column(db.Text, nullable=False)
+    status = db.Column(db.Enum('queued', 'done', 'failed'), nullable=False, default='queued')
+    # JSON parse result
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    event_id = db.Column(db.Integer)
+    insight_id = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, index=True)
+
+class EventChange(db.Model):
+    # Append-only change log; version is the sync token. Deleted events keep
+    # a 'delete' row here as their tombstone.
+    __tablename__ = 'event_changes'
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, nullable=False, index=True)
+    operation = db.Column(db.Enum('upsert', 'delete'), nullable=False)
+    version = db.Column(db.BigInteger, nullable=False, index=True)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SyncState(db.Model):
+    # Single row (id 1) holding the last sync version handed out. Writers
+    # bump it under a row lock held until commit, so versions become visible
+    # in commit order; auto-increment ids are allocated at insert instead.
+    __tablename__ = 'sync_state'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+class EventDailyStat(db.Model):
+    # Per-day, per-category aggregates maintained alongside event writes
+    __tablename__ = 'event_daily_stats'
+    date = db.Column(db.Date, primary_key=True)
+    category = db.Column(db.String(50), primary_key=True)
+    event_count = db.Column(db.Integer, nullable=False, default=0)
+    total_minutes = db.Column(db.Integer, nullable=False, default=0)
+
+class EventCategoryStat(db.Model):
+    # All-time per-category totals, so the category breakdown does not
+    # grow with the number of days of history
+    __tablename__ = 'event_category_stats'
+    category = db.Column(db.String(50), primary_key=True)
+    event_count = db.Column(db.Integer, nullable=False, default=0)
+    total_minutes = db.Column(db.Integer, nullable=False, default=0)
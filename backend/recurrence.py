@@ -0,0 +1,170 @@
+import threading
+from calendar import monthrange
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+WEEKDAY_CODES = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+Rule = namedtuple('Rule', 'freq interval count until byday exdates')
+
+def _parse_date(value):
+    value = value.strip()
+    if '-' in value:
+        return datetime.fromisoformat(value[:10]).date()
+    return datetime.strptime(value[:8], '%Y%m%d').date()
+
+@lru_cache(maxsize=1024)
+def parse_rule(pattern):
+    """Parse the supported RRULE subset, e.g.
+
+    FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;UNTIL=20241231;EXDATE=20240115
+
+    FREQ is DAILY, WEEKLY or MONTHLY; COUNT and UNTIL are mutually exclusive;
+    EXDATE lists dates to skip. Raises ValueError for anything else.
+    """
+    if not pattern:
+        raise ValueError('Empty recurrence pattern')
+    if pattern.upper().startswith('RRULE:'):
+        pattern = pattern[6:]
+    parts = {}
+    for part in pattern.split(';'):
+        key, sep, value = part.partition('=')
+        if not sep:
+            raise ValueError(f'Malformed recurrence part: {part!r}')
+        parts[key.strip().upper()] = value.strip()
+
+    unknown = set(parts) - {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY', 'EXDATE'}
+    if unknown:
+        raise ValueError(f"Unsupported recurrence parts: {', '.join(sorted(unknown))}")
+    freq = parts.get('FREQ', '').upper()
+    if freq not in ('DAILY', 'WEEKLY', 'MONTHLY'):
+        raise ValueError('FREQ must be DAILY, WEEKLY or MONTHLY')
+    if 'COUNT' in parts and 'UNTIL' in parts:
+        raise ValueError('COUNT and UNTIL cannot be combined')
+
+    interval = int(parts.get('INTERVAL', 1))
+    count = int(parts['COUNT']) if 'COUNT' in parts else None
+    if interval < 1 or (count is not None and count < 1):
+        raise ValueError('INTERVAL and COUNT must be positive')
+    until = _parse_date(parts['UNTIL']) if 'UNTIL' in parts else None
+    byday = ()
+    if 'BYDAY' in parts:
+        if freq != 'WEEKLY':
+            raise ValueError('BYDAY is only supported with FREQ=WEEKLY')
+        try:
+            byday = tuple(sorted({WEEKDAY_CODES.index(code.strip().upper()) for code in parts['BYDAY'].split(',')}))
+        except ValueError:
+            raise ValueError(f"Invalid BYDAY: {parts['BYDAY']}")
+    exdates = frozenset(_parse_date(value) for value in parts['EXDATE'].split(',') if value.strip()) \
+        if 'EXDATE' in parts else frozenset()
+    return Rule(freq, interval, count, until, byday, exdates)
+
+def _daily(rule, start, window_from):
+    # Jump straight to the first occurrence on or after window_from
+    k = max(0, -(-(window_from - start).days // rule.interval))
+    while True:
+        yield k, start + timedelta(days=k * rule.interval)
+        k += 1
+
+def _weekly(rule, start, window_from):
+    weekdays = rule.byday or (start.weekday(),)
+    first_week = [day for day in weekdays if day >= start.weekday()]
+    week0 = start - timedelta(days=start.weekday())
+    w = max(0, (window_from - week0).days // (7 * rule.interval))
+    while True:
+        monday = week0 + timedelta(weeks=w * rule.interval)
+        if w == 0:
+            days, base = first_week, 0
+        else:
+            days, base = weekdays, len(first_week) + (w - 1) * len(weekdays)
+        for i, day in enumerate(days):
+            yield base + i, monday + timedelta(days=day)
+        w += 1
+
+def _monthly(rule, start, window_from):
+    # Months without the start's day of month are skipped and do not count
+    # toward COUNT, so counted rules are walked from the start.
+    k = 0
+    if rule.count is None:
+        months = (window_from.year - start.year) * 12 + window_from.month - start.month
+        k = max(0, months // rule.interval)
+    index = 0
+    while True:
+        month0 = start.month - 1 + k * rule.interval
+        year, month = start.year + month0 // 12, month0 % 12 + 1
+        if start.day <= monthrange(year, month)[1]:
+            yield index, date(year, month, start.day)
+            index += 1
+        k += 1
+
+_GENERATORS = {'DAILY': _daily, 'WEEKLY': _weekly, 'MONTHLY': _monthly}
+
+def occurrences(rule, start, window_from, window_to):
+    """Yield occurrence dates of a series starting on start within [window_from, window_to].
+
+    Only the requested window is generated; earlier occurrences are skipped
+    arithmetically wherever COUNT does not require counting them.
+    """
+    end = min(window_to, rule.until) if rule.until else window_to
+    window_from = max(window_from, start)
+    if window_from > end:
+        return
+    for index, day in _GENERATORS[rule.freq](rule, start, window_from):
+        if day > end or (rule.count is not None and index >= rule.count):
+            return
+        if day >= window_from and day not in rule.exdates:
+            yield day
+
+class ExpansionCache:
+    """LRU of expanded occurrence dates per (series, window).
+
+    Entries remember the pattern and start date they were expanded from, so
+    a series edited by another worker is re-expanded rather than served stale;
+    invalidate() drops a series' entries eagerly on local writes.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._by_series = {}
+        self._lock = threading.Lock()
+
+    def expand(self, series_id, pattern, start, window_from, window_to):
+        key = (series_id, window_from, window_to)
+        signature = (pattern, start)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        dates = tuple(occurrences(parse_rule(pattern), start, window_from, window_to))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (signature, dates)
+            self._entries.move_to_end(key)
+            self._by_series.setdefault(series_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                old_key, _ = self._entries.popitem(last=False)
+                self._discard(old_key)
+        return dates
+
+    def invalidate(self, series_id):
+        with self._lock:
+            for key in self._by_series.pop(series_id, ()):
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+    def _discard(self, key):
+        keys = self._by_series.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_series[key[0]]
@@ -0,0 +1,402 @@
+import hashlib
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+# Listings spanning more months than this depend on the 'all' tag instead
+# of one tag per month
+MAX_RANGE_MONTHS = 24
+
+def month_tag(date):
+    return f'month:{date.year}-{date.month:02d}'
+
+def range_tags(date_from, date_to):
+    """Tags a date-range listing depends on.
+
+    Every write bumps 'all' and the month tags of the dates it touches, plus
+    'recurring' for series, whose occurrences reach into later months.
+    """
+    if date_from is None or date_to is None or date_to < date_from:
+        return ['all']
+    months = (date_to.year - date_from.year) * 12 + date_to.month - date_from.month + 1
+    if months > MAX_RANGE_MONTHS:
+        return ['all']
+    tags = ['recurring']
+    year, month = date_from.year, date_from.month
+    for _ in range(months):
+        tags.append(f'month:{year}-{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return tags
+
+def new_version():
+    # Random rather than incremented, so two workers bumping a tag at the
+    # same time can never both land on the same version
+    return os.urandom(6).hex()
+
+class ProcessCounters:
+    """Hit, miss and invalidation counts kept in this process only."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._counts_lock = threading.Lock()
+
+    def incr(self, name):
+        with self._counts_lock:
+            self._counts[name] += 1
+
+    def counters(self):
+        with self._counts_lock:
+            return dict(self._counts)
+
+    def close(self):
+        pass
+
+class NullCache(ProcessCounters):
+    def get(self, key):
+        return None
+
+    def set(self, key, value, timeout):
+        pass
+
+    def versions(self, tags):
+        return ['0'] * len(tags)
+
+    def bump(self, tags):
+        pass
+
+    def stats(self):
+        return {'size': 0, 'evictions': 0}
+
+class LocalCache(ProcessCounters):
+    """In-process LRU bounded to maxsize entries, with per-entry expiry.
+
+    Tag versions and counters live in this process only, so writes made by
+    other worker processes are not seen; use it with a single worker.
+    """
+
+    def __init__(self, maxsize=500):
+        super().__init__()
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def versions(self, tags):
+        return [self._versions.get(tag, '0') for tag in tags]
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = new_version()
+
+    def stats(self):
+        return {'size': len(self._entries), 'maxsize': self.maxsize, 'evictions': self.evictions}
+
+class FileSystemCache(ProcessCounters):
+    """Entries and tag versions as files in one directory.
+
+    Shared by every worker process on the host. Files are replaced
+    atomically, and once more than threshold entries exist the oldest are
+    pruned. Tag files are never pruned, since a lost version could make an
+    older entry reachable again.
+
+    Each process writes its counters to a file of its own at most once per
+    second, and stats sum those files. Files of workers that exited (through
+    close(), or found dead on this host when reading) are folded into one
+    totals file, so recycled workers do not pile up files.
+    """
+
+    def __init__(self, directory, threshold=500):
+        super().__init__()
+        self.directory = directory
+        self.threshold = threshold
+        self.evictions = 0
+        self._tags = os.path.join(directory, 'tags')
+        os.makedirs(self._tags, exist_ok=True)
+        self._counters = os.path.join(directory, 'counters')
+        os.makedirs(self._counters, exist_ok=True)
+        # The pid alone could be reused by a later worker
+        self._host = socket.gethostname()
+        self._counters_file = os.path.join(self._counters, f'{self._host}-{os.getpid()}-{os.urandom(3).hex()}')
+        self._flushed = 0.0
+        self._closed = False
+        self._writes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def _read(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, path, text):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        text = self._read(self._path(key))
+        if text is None:
+            return None
+        expires, _, payload = text.partition('\n')
+        if float(expires) < time.time():
+            return None
+        return json.loads(payload)
+
+    def set(self, key, value, timeout):
+        self._write(self._path(key), f'{time.time() + timeout}\n{json.dumps(value)}')
+        self._writes += 1
+        if self._writes % 50 == 0:
+            self._prune()
+
+    def _prune(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                entries.append((entry.stat().st_mtime, entry.path))
+        if len(entries) <= self.threshold:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.threshold]:
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+
+    def versions(self, tags):
+        return [self._read(os.path.join(self._tags, tag.replace(':', '_'))) or '0' for tag in tags]
+
+    def bump(self, tags):
+        for tag in tags:
+            self._write(os.path.join(self._tags, tag.replace(':', '_')), new_version())
+
+    def incr(self, name):
+        super().incr(name)
+        if time.monotonic() - self._flushed >= 1:
+            self._flush()
+
+    def _flush(self):
+        self._flushed = time.monotonic()
+        if not self._closed:
+            self._write(self._counters_file, json.dumps(super().counters()))
+
+    @contextmanager
+    def _counters_lock(self):
+        # O_EXCL creation works across processes on every platform; a lock
+        # left by a killed worker is taken over after a few seconds
+        path = os.path.join(self._counters, 'lock')
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _exited(self, name):
+        # Files are named host-pid-random; only pids of this host can be checked
+        host, _, pid = name.rpartition('-')[0].rpartition('-')
+        if os.name != 'posix' or host != self._host or not pid.isdigit():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            pass
+        return False
+
+    def _fold(self, paths):
+        # Called under the lock: move finished workers' counts into totals
+        totals_path = os.path.join(self._counters, 'totals')
+        totals = Counter(json.loads(self._read(totals_path) or '{}'))
+        for path in paths:
+            totals.update(json.loads(self._read(path) or '{}'))
+        self._write(totals_path, json.dumps(totals))
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return totals
+
+    def counters(self):
+        self._flush()
+        with self._counters_lock():
+            live, exited = [], []
+            for entry in os.scandir(self._counters):
+                if entry.name not in ('lock', 'totals'):
+                    (exited if self._exited(entry.name) else live).append(entry.path)
+            if exited:
+                totals = self._fold(exited)
+            else:
+                totals = Counter(json.loads(self._read(os.path.join(self._counters, 'totals')) or '{}'))
+            for path in live:
+                totals.update(json.loads(self._read(path) or '{}'))
+        return dict(totals)
+
+    def close(self):
+        # Called once per worker on shutdown
+        self._flush()
+        self._closed = True
+        with self._counters_lock():
+            self._fold([self._counters_file])
+
+    def stats(self):
+        size = sum(1 for entry in os.scandir(self.directory) if entry.is_file())
+        return {'size': size, 'maxsize': self.threshold, 'evictions': self.evictions}
+
+class RedisCache:
+    """Shared across workers and hosts; needs the redis package."""
+
+    def __init__(self, url, prefix='planifyai:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('CACHE_TYPE=redis requires the redis package (pip install redis)')
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, timeout):
+        self.client.set(self.prefix + key, json.dumps(value), ex=timeout)
+
+    def versions(self, tags):
+        values = self.client.mget([self.prefix + 'tag:' + tag for tag in tags])
+        return [value.decode() if value is not None else '0' for value in values]
+
+    def bump(self, tags):
+        with self.client.pipeline() as pipe:
+            for tag in tags:
+                pipe.set(self.prefix + 'tag:' + tag, new_version())
+            pipe.execute()
+
+    def incr(self, name):
+        self.client.hincrby(self.prefix + 'counters', name, 1)
+
+    def counters(self):
+        return {name.decode(): int(count) for name, count in self.client.hgetall(self.prefix + 'counters').items()}
+
+    def close(self):
+        self.client.close()
+
+    def stats(self):
+        info = self.client.info('stats')
+        return {'size': self.client.dbsize(), 'evictions': info.get('evicted_keys', 0)}
+
+class ResponseCache:
+    """Caches rendered read responses, invalidated by tag on writes.
+
+    A cache key embeds the current versions of the tags the response
+    depends on, and writes bump those versions. Entries built before a write
+    are never found again and age out through the LRU or expiry.
+
+    Hits, misses and invalidations are counted in the backend, so the
+    filesystem and redis backends report totals across workers.
+    """
+
+    def __init__(self):
+        self.backend = NullCache()
+        self.type = 'null'
+        self.timeout = 300
+
+    def init_app(self, app):
+        self.type = app.config['CACHE_TYPE']
+        self.timeout = app.config['CACHE_DEFAULT_TIMEOUT']
+        if self.type == 'simple':
+            self.backend = LocalCache(app.config['CACHE_THRESHOLD'])
+        elif self.type == 'filesystem':
+            self.backend = FileSystemCache(app.config['CACHE_DIR'], app.config['CACHE_THRESHOLD'])
+        elif self.type == 'redis':
+            self.backend = RedisCache(app.config['CACHE_REDIS_URL'])
+        elif self.type == 'null':
+            self.backend = NullCache()
+        else:
+            raise ValueError(f"Unknown CACHE_TYPE: {self.type}")
+
+    @property
+    def enabled(self):
+        return self.type != 'null'
+
+    def key(self, endpoint, params, tags):
+        return f"{endpoint}?{params}#{'.'.join(self.backend.versions(tags))}"
+
+    def get(self, endpoint, key):
+        value = self.backend.get(key)
+        self.backend.incr(f"{'misses' if value is None else 'hits'}:{endpoint}")
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value, self.timeout)
+
+    def close(self):
+        self.backend.close()
+
+    def invalidate(self, tags):
+        if tags:
+            self.backend.bump(sorted(tags))
+            self.backend.incr('invalidations')
+
+    def stats(self):
+        counts = self.backend.counters()
+        endpoints = {}
+        for name, count in counts.items():
+            kind, _, endpoint = name.partition(':')
+            if endpoint:
+                endpoints.setdefault(endpoint, {'hits': 0, 'misses': 0})[kind] = count
+        hits = sum(entry['hits'] for entry in endpoints.values())
+        misses = sum(entry['misses'] for entry in endpoints.values())
+        return {
+            'type': self.type,
+            'hits': hits,
+            'misses': misses,
+            'hitRatio': round(hits / (hits + misses), 4) if hits + misses else None,
+            'invalidations': counts.get('invalidations', 0),
+            'endpoints': endpoints,
+            **self.backend.stats()
+        }
@@ -0,0 +1,78 @@
+"""VoiceAI output against a checked-in golden corpus, with the clock pinned.
+
+The corpus holds transcript -> expected result pairs recorded from the
+original parser. Regenerate it only for an intended behaviour change:
+
+    python -m tests.test_voice_ai_golden --update
+"""
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import voice_ai  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'voice_commands.json')
+
+with open(CORPUS, encoding='utf-8') as f:
+    GOLDEN = json.load(f)
+
+class PinnedDateTime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls.fromisoformat(GOLDEN['now'])
+
+def parse(parser, transcript):
+    try:
+        return {'expected': parser.process_voice_command(transcript)}
+    except Exception as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+
+@pytest.fixture
+def pinned_clock(monkeypatch):
+    monkeypatch.setattr(voice_ai, 'datetime', PinnedDateTime)
+
+@pytest.mark.parametrize('mode', ['uncached', 'cached', 'timed'])
+def test_matches_golden_corpus(pinned_clock, mode):
+    parser = voice_ai.VoiceAI(workers=1, cache_size=0 if mode == 'uncached' else 4096)
+    if mode == 'timed':
+        parser.observe_extractor = lambda name, seconds: None
+    # The second pass of the cached modes is served from the result cache
+    passes = 1 if mode == 'uncached' else 2
+    mismatches = []
+    for _ in range(passes):
+        for case in GOLDEN['cases']:
+            expected = {key: case[key] for key in ('expected', 'error') if key in case}
+            actual = parse(parser, case['transcript'])
+            if actual != expected:
+                mismatches.append((case['transcript'], expected, actual))
+    assert not mismatches, f'{len(mismatches)} mismatches, first: {mismatches[0]}'
+
+def test_cached_results_are_copies(pinned_clock):
+    parser = voice_ai.VoiceAI(workers=1)
+    first = parser.process_voice_command('Schedule meeting with John tomorrow at 2 PM')
+    expected = json.loads(json.dumps(first))
+    # Callers annotate results in place
+    first['event']['participants'].append('Mallory')
+    first['conflicts'] = [1]
+    assert parser.process_voice_command('Schedule meeting with John tomorrow at 2 PM') == expected
+    assert parser.cache_stats()['hits'] == 1
+
+def write_corpus(cases):
+    # One case per line keeps diffs of a regenerated corpus readable
+    with open(CORPUS, 'w', encoding='utf-8') as f:
+        f.write('{"now": %s, "cases": [\n' % json.dumps(GOLDEN['now']))
+        f.write(',\n'.join(json.dumps(case, sort_keys=True) for case in cases))
+        f.write('\n]}\n')
+
+if __name__ == '__main__':
+    if sys.argv[1:] != ['--update']:
+        sys.exit(__doc__)
+    voice_ai.datetime = PinnedDateTime
+    parser = voice_ai.VoiceAI(workers=1, cache_size=0)
+    write_corpus([dict(transcript=case['transcript'], **parse(parser, case['transcript']))
+                  for case in GOLDEN['cases']])
@@ -1,296 +1,540 @@
+import multiprocessing
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from time import perf_counter
+
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june',
+          'july', 'august', 'september', 'october', 'november', 'december']
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+COMMAND_WORDS = ['schedule', 'add', 'create', 'book', 'plan', 'set', 'make']
+ACTION_WORDS = ['schedule', 'add', 'create', 'book', 'plan']
+
+TIME_KEYWORDS = {
+    'morning': '09:00', 'noon': '12:00', 'afternoon': '14:00',
+    'evening': '18:00', 'night': '20:00', 'midnight': '00:00'
+}
+
+DURATION_KEYWORDS = {
+    'meeting': 60, 'call': 30, 'conference': 120, 'standup': 15,
+    'lunch': 60, 'dinner': 90, 'breakfast': 30,
+    'workout': 60, 'gym': 90, 'run': 30,
+    'appointment': 45, 'checkup': 30, 'interview': 60,
+    'class': 90, 'lecture': 120, 'seminar': 180,
+    'break': 15
+}
+
+CATEGORY_KEYWORDS = {
+    'meeting': ['meeting', 'call', 'conference', 'sync', 'standup', 'discussion'],
+    'work': ['work', 'project', 'task', 'coding', 'development', 'review'],
+    'personal': ['lunch', 'dinner', 'breakfast', 'gym', 'workout', 'run', 'break'],
+    'health': ['doctor', 'appointment', 'checkup', 'dentist', 'hospital'],
+    'education': ['class', 'lecture', 'seminar', 'study', 'exam', 'course'],
+    'social': ['party', 'event', 'celebration', 'birthday', 'wedding']
+}
+
+HIGH_PRIORITY = ['urgent', 'important', 'critical', 'asap', 'priority', 'emergency']
+LOW_PRIORITY = ['optional', 'maybe', 'if possible', 'casual', 'flexible']
+HIGH_PRIORITY_TOPICS = ['doctor', 'hospital', 'emergency']
+MEDIUM_PRIORITY_TOPICS = ['meeting', 'interview', 'exam']
+
+COMMON_LOCATIONS = ['office', 'home', 'gym', 'hospital', 'school', 'university', 'library']
+ONLINE_WORDS = ['online', 'zoom', 'teams', 'skype', 'virtual']
+
+DATE_WORDS = ['today', 'tomorrow'] + WEEKDAYS
+
+# Every literal the extractors test for with a plain substring check. The
+# transcript is scanned for all of them once per command and the extractors
+# then work off the resulting set of hits.
+KEYWORDS = tuple(sorted(set(
+    MONTHS + WEEKDAYS + COMMAND_WORDS + list(TIME_KEYWORDS) + list(DURATION_KEYWORDS)
+    + [word for words in CATEGORY_KEYWORDS.values() for word in words]
+    + HIGH_PRIORITY + LOW_PRIORITY + HIGH_PRIORITY_TOPICS + MEDIUM_PRIORITY_TOPICS
+    + COMMON_LOCATIONS + ONLINE_WORDS
+    + ['today', 'this day', 'tomorrow', 'next day', 'day after tomorrow', 'next week', 'next',
+       'am', 'pm', 'with', 'team', 'everyone', 'all', 'at', 'in', 'room']
+)))
+
+_MONTH_SET = frozenset(MONTHS)
+_DATE_WORD_SET = frozenset(DATE_WORDS)
+_COMMAND_WORD_SET = frozenset(COMMAND_WORDS)
+_ACTION_WORD_SET = frozenset(ACTION_WORDS)
+
+_MONTH_ALT = '|'.join(MONTHS)
+_WEEKDAY_ALT = '|'.join(WEEKDAYS)
+
+_DIGIT = re.compile(r'\d')
+
+_TITLE_COMMAND = re.compile(r'\b(' + '|'.join(COMMAND_WORDS) + r')\b')
+_TITLE_TIME = re.compile(r'\b\d{1,2}:?\d{0,2}\s*(am|pm|a\.m\.|p\.m\.)\b')
+_TITLE_DAY_MONTH = re.compile(r'\b\d{1,2}\s+(' + _MONTH_ALT + r')\b')
+_TITLE_MONTH_DAY = re.compile(r'\b(' + _MONTH_ALT + r')\s+\d{1,2}\b')
+_TITLE_DAY_NAME = re.compile(r'\b(today|tomorrow|' + _WEEKDAY_ALT + r')\b')
+_TITLE_RELATIVE = re.compile(r'\b(next|this)\s+(week|month|' + _WEEKDAY_ALT + r')\b')
+_TITLE_PREPOSITION = re.compile(r'\b(at|in|on)\s+[a-z]+\b')
+_TITLE_PARTICIPANTS = re.compile(r'\bwith\s+[a-z\s]+')
+
+# Only the month-name formats ever resolve to a date
+_DATE_PATTERNS = [
+    re.compile(r'(\d{1,2})\s+(' + _MONTH_ALT + ')', re.IGNORECASE),
+    re.compile(r'(' + _MONTH_ALT + r')\s+(\d{1,2})', re.IGNORECASE),
+]
+
+_TIME_PATTERNS = [
+    re.compile(r'(\d{1,2}):(\d{2})\s*(am|pm)', re.IGNORECASE),
+    re.compile(r'(\d{1,2})\s*(am|pm)', re.IGNORECASE),
+    re.compile(r'(\d{1,2}):(\d{2})', re.IGNORECASE),
+    re.compile(r'at\s+(\d{1,2})', re.IGNORECASE),
+    re.compile(r'(\d{1,2})\s*o\'?clock', re.IGNORECASE),
+]
+
+_DURATION = re.compile(r'(\d+)\s*(hour|hours|hr|hrs|minute|minutes|min|mins)')
+
+_LOCATION_AT = re.compile(r'at\s+([A-Za-z\s]+?)(?:\s+(?:on|at|with|for)|\s*$)', re.IGNORECASE)
+_LOCATION_IN = re.compile(r'in\s+([A-Za-z\s]+?)(?:\s+(?:on|at|with|for)|\s*$)', re.IGNORECASE)
+_LOCATION_ROOM = re.compile(r'room\s+(\w+)', re.IGNORECASE)
+_LOCATION_CONFERENCE_ROOM = re.compile(r'conference\s+room\s+(\w+)', re.IGNORECASE)
+
+_PARTICIPANTS = re.compile(r'with\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', re.IGNORECASE)
+
+_CONFIDENCE_TIME = re.compile(r'\d{1,2}:?\d{0,2}\s*(am|pm)')
+_CONFIDENCE_DATE = re.compile(r'\d{1,2}\s+(' + _MONTH_ALT + ')')
+
+_SUGGESTION_DURATION = re.compile(r'\d+\s*(hour|minute)')
+
+# Batches smaller than this are parsed inline; shipping them to the pool
+# costs more than the parse itself.
+MIN_PARALLEL_BATCH = 64
+
+EXTRACTORS = ('title', 'date', 'time', 'duration', 'category', 'priority', 'location', 'participants')
+
+class DayTable:
+    """Relative date words resolved to ISO dates for one day, until its midnight."""
+
+    def __init__(self, today):
+        self.today = today
+        self.ordinal = today.toordinal()
+        self.expires = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        self.relative = {
+            word: (today + timedelta(days=offset)).isoformat()
+            for word, offset in (('today', 0), ('tomorrow', 1), ('day after tomorrow', 2), ('next week', 7))
+        }
+        # Per weekday: (the coming one, the one after with 'next')
+        self.weekdays = []
+        for i in range(7):
+            days_ahead = (i - today.weekday()) % 7 or 7
+            self.weekdays.append(((today + timedelta(days=days_ahead)).isoformat(),
+                                  (today + timedelta(days=days_ahead + 7)).isoformat()))
+        self._month_days = {}
+
+    def month_day(self, month, day):
+        """Next occurrence of month/day on or after today; invalid days raise like datetime() does."""
+        iso = self._month_days.get((month, day))
+        if iso is None:
+            target_date = datetime(self.today.year, month, day).date()
+            if target_date < self.today:
+                target_date = datetime(self.today.year + 1, month, day).date()
+            iso = self._month_days[(month, day)] = target_date.isoformat()
+        return iso
+
+def _end_time(time, duration):
+    hour, minute = map(int, time.split(':'))
+    if hour > 23 or minute > 59:
+        # Same error datetime.strptime(time, '%H:%M') used to raise
+        raise ValueError(f"time data {time!r} does not match format '%H:%M'")
+    end_minutes = (hour * 60 + minute + duration) % (24 * 60)
+    return f"{end_minutes // 60:02d}:{end_minutes % 60:02d}"
+
+def _copy_result(result):
+    # Callers annotate results in place, so a cached one is never handed out
+    return {
+        **result,
+        'event': {**result['event'], 'participants': list(result['event']['participants'])},
+        'suggestions': list(result['suggestions'])
+    }
+
+_worker_voice_ai = None
+
+def _process_in_worker(transcript):
+    global _worker_voice_ai
+    if _worker_voice_ai is None:
+        _worker_voice_ai = VoiceAI(workers=1)
+    return _worker_voice_ai.process_safe(transcript)
 
 class VoiceAI:
+    def __init__(self, workers=None, cache_size=1024):
+        self.workers = workers or os.cpu_count() or 1
+        # Optional callback(extractor_name, seconds); None skips the timing
+        self.observe_extractor = None
+        # Parse results by (day, transcript), least recently used first; 0 disables
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._day_table = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def process_many(self, transcripts, chunksize=None):
+        """Parse many transcripts, yielding results in input order.
+
+        A transcript that fails to parse yields an error result instead of
+        aborting the batch.
+        """
+        transcripts = list(transcripts)
+        if self.workers <= 1 or len(transcripts) < MIN_PARALLEL_BATCH:
+            for transcript in transcripts:
+                yield self.process_safe(transcript)
+            return
+
+        pool = self._get_pool()
+        if chunksize is None:
+            chunksize = min(max(len(transcripts) // (self.workers * 4), 1), 256)
+        yield from pool.map(_process_in_worker, transcripts, chunksize=chunksize)
+
+    def _get_pool(self):
+        # Concurrent batch requests must not each build a pool. Workers are
+        # started from a clean process rather than forked from this
+        # multi-threaded one, whose locks a fork could copy mid-acquire.
+        with self._pool_lock:
+            if self._pool is None:
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context(method))
+            return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def process_safe(self, transcript):
+        try:
+            return self.process_voice_command(transcript)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def cache_stats(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'size': len(self._cache),
+            'maxsize': self.cache_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hitRatio': round(self.cache_hits / lookups, 4) if lookups else None
+        }
+
+    def _days(self):
+        now = datetime.now()
+        days = self._day_table
+        if days is None or now >= days.expires:
+            days = self._day_table = DayTable(now.date())
+        return days
+
     def process_voice_command(self, transcript):
         transcript = transcript.lower().strip()
-        
-        title = self._extract_title(transcript)
-        date = self._extract_date(transcript)
-        time = self._extract_time(transcript)
-        duration = self._extract_duration(transcript)
-        category = self._extract_category(transcript)
-        priority = self._extract_priority(transcript)
-        location = self._extract_location(transcript)
-        participants = self._extract_participants(transcript)
-        
-        start_time = datetime.strptime(time, '%H:%M')
-        end_time = start_time + timedelta(minutes=duration)
-        
+        if not self.cache_size:
+            return self._parse(transcript, self._scan(transcript))
+
+        # Keyed by the day, so relative dates never outlive their midnight
+        key = (self._days().ordinal, transcript)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        if entry is not None:
+            cached, floating = entry
+            result = _copy_result(cached)
+            if floating:
+                # No time was given, so it is still relative to the clock
+                event = result['event']
+                event['time'] = self._default_time()
+                event['endTime'] = _end_time(event['time'], event['duration'])
+            return result
+
+        hits = self._scan(transcript)
+        result = self._parse(transcript, hits)
+        floating = self._explicit_time(transcript, hits) is None
+        with self._cache_lock:
+            if key[0] != next(iter(self._cache), key)[0]:
+                # First parse of a new day: the old day's entries can never hit again
+                self._cache.clear()
+            self._cache[key] = (result, floating)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return _copy_result(result)
+
+    def _parse(self, transcript, hits):
+
+        if self.observe_extractor is None:
+            title = self._extract_title(transcript, hits)
+            date = self._extract_date(transcript, hits)
+            time = self._extract_time(transcript, hits)
+            duration = self._extract_duration(transcript, hits)
+            category = self._extract_category(transcript, hits)
+            priority = self._extract_priority(transcript, hits)
+            location = self._extract_location(transcript, hits)
+            participants = self._extract_participants(transcript, hits)
+        else:
+            title, date, time, duration, category, priority, location, participants = \
+                self._extract_timed(transcript, hits)
+
+        end_time = _end_time(time, duration)
+
         return {
             'success': True,
             'event': {
                 'title': title,
                 'date': date,
                 'time': time,
-                'endTime': end_time.strftime('%H:%M'),
+                'endTime': end_time,
                 'category': category,
                 'priority': priority,
                 'location': location,
                 'participants': participants,
                 'duration': duration
             },
-            'confidence': self._calculate_confidence(transcript),
-            'suggestions': self._get_suggestions(transcript, category)
+            'confidence': self._calculate_confidence(transcript, hits),
+            'suggestions': self._get_suggestions(transcript, category, hits)
         }
 
-    def _extract_title(self, transcript):
+    def _extract_timed(self, transcript, hits):
+        values = []
+        for name in EXTRACTORS:
+            started = perf_counter()
+            values.append(getattr(self, '_extract_' + name)(transcript, hits))
+            self.observe_extractor(name, perf_counter() - started)
+        return values
+
+    def _scan(self, transcript):
+        return frozenset(word for word in KEYWORDS if word in transcript)
+
+    def _extract_title(self, transcript, hits):
+        # Each substitution only runs when a literal it needs is present.
+        # Removals always start at a word boundary, so they never create a
+        # new word and the hits of the full transcript stay a valid guard.
+        title = transcript
+
         # Remove command words first
-        title = re.sub(r'\b(schedule|add|create|book|plan|set|make)\b', '', transcript)
-        
+        if hits & _COMMAND_WORD_SET:
+            title = _TITLE_COMMAND.sub('', title)
+
         # Remove time information
-        title = re.sub(r'\b\d{1,2}:?\d{0,2}\s*(am|pm|a\.m\.|p\.m\.)\b', '', title)
-        
+        if 'am' in title or 'pm' in title or '.m.' in title:
+            title = _TITLE_TIME.sub('', title)
+
         # Remove date information
-        title = re.sub(r'\b\d{1,2}\s+(january|february|march|april|may|june|july|august|september|october|november|december)\b', '', title)
-        title = re.sub(r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}\b', '', title)
-        title = re.sub(r'\b(today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b', '', title)
-        title = re.sub(r'\b(next|this)\s+(week|month|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b', '', title)
-        
+        if hits & _MONTH_SET:
+            title = _TITLE_DAY_MONTH.sub('', title)
+            title = _TITLE_MONTH_DAY.sub('', title)
+        if hits & _DATE_WORD_SET:
+            title = _TITLE_DAY_NAME.sub('', title)
+        if 'next' in title or 'this' in title:
+            title = _TITLE_RELATIVE.sub('', title)
+
         # Remove location prepositions
-        title = re.sub(r'\b(at|in|on)\s+[a-z]+\b', '', title)
-        
+        title = _TITLE_PREPOSITION.sub('', title)
+
         # Remove participant information
-        title = re.sub(r'\bwith\s+[a-z\s]+', '', title)
-        
+        if 'with' in hits:
+            title = _TITLE_PARTICIPANTS.sub('', title)
+
         # Clean up extra spaces and capitalize
         title = ' '.join(title.split())
         return title.title() if title else "New Event"
 
-    def _extract_date(self, transcript):
-        today = datetime.now().date()
-        
+    def _extract_date(self, transcript, hits):
+        days = self._days()
+
         # Specific date formats
-        date_patterns = [
-            r'(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december)',
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})',
-            r'(\d{1,2})/(\d{1,2})/(\d{2,4})',
-            r'(\d{1,2})-(\d{1,2})-(\d{2,4})'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, transcript, re.IGNORECASE)
-            if match:
-                if 'january' in pattern or 'february' in pattern:
-                    if len(match.groups()) == 2:
-                        if match.group(1).isdigit():
-                            day, month_name = match.groups()
-                        else:
-                            month_name, day = match.groups()
-                        
-                        months = ['january', 'february', 'march', 'april', 'may', 'june', 
-                                'july', 'august', 'september', 'october', 'november', 'december']
-                        month = months.index(month_name.lower()) + 1
-                        day = int(day)
-                        year = today.year
-                        
-                        target_date = datetime(year, month, day).date()
-                        if target_date < today:
-                            target_date = datetime(year + 1, month, day).date()
-                        
-                        return target_date.isoformat()
-        
+        if hits & _MONTH_SET:
+            for pattern in _DATE_PATTERNS:
+                match = pattern.search(transcript)
+                if match:
+                    if match.group(1).isdigit():
+                        day, month_name = match.groups()
+                    else:
+                        month_name, day = match.groups()
+
+                    return days.month_day(MONTHS.index(month_name.lower()) + 1, int(day))
+
         # Relative dates
-        if any(word in transcript for word in ['today', 'this day']):
-            return today.isoformat()
-        elif any(word in transcript for word in ['tomorrow', 'next day']):
-            return (today + timedelta(days=1)).isoformat()
-        elif 'day after tomorrow' in transcript:
-            return (today + timedelta(days=2)).isoformat()
-        elif 'next week' in transcript:
-            return (today + timedelta(days=7)).isoformat()
-        
+        if 'today' in hits or 'this day' in hits:
+            return days.relative['today']
+        elif 'tomorrow' in hits or 'next day' in hits:
+            return days.relative['tomorrow']
+        elif 'day after tomorrow' in hits:
+            return days.relative['day after tomorrow']
+        elif 'next week' in hits:
+            return days.relative['next week']
+
         # Specific days
-        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        for i, day in enumerate(days):
-            if day in transcript:
-                days_ahead = (i - today.weekday()) % 7
-                if days_ahead == 0:
-                    days_ahead = 7
-                if 'next' in transcript:
-                    days_ahead += 7
-                return (today + timedelta(days=days_ahead)).isoformat()
-        
-        return today.isoformat()
-
-    def _extract_time(self, transcript):
-        # Enhanced time patterns
-        time_patterns = [
-            r'(\d{1,2}):(\d{2})\s*(am|pm)',
-            r'(\d{1,2})\s*(am|pm)',
-            r'(\d{1,2}):(\d{2})',
-            r'at\s+(\d{1,2})',
-            r'(\d{1,2})\s*o\'?clock'
-        ]
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, transcript, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-                hour = int(groups[0])
-                minute = int(groups[1]) if len(groups) > 1 and groups[1] and groups[1].isdigit() else 0
-                
-                if len(groups) > 2 and groups[2]:
-                    period = groups[2].lower()
-                    if 'pm' in period and hour != 12:
-                        hour += 12
-                    elif 'am' in period and hour == 12:
-                        hour = 0
-                elif len(groups) > 1 and groups[1] and not groups[1].isdigit():
-                    period = groups[1].lower()
-                    if 'pm' in period and hour != 12:
-                        hour += 12
-                    elif 'am' in period and hour == 12:
-                        hour = 0
-                
-                return f"{hour:02d}:{minute:02d}"
-        
+        for i, day in enumerate(WEEKDAYS):
+            if day in hits:
+                return days.weekdays[i]['next' in hits]
+
+        return days.relative['today']
+
+    def _extract_time(self, transcript, hits):
+        time = self._explicit_time(transcript, hits)
+        return time if time is not None else self._default_time()
+
+    def _default_time(self):
+        return (datetime.now() + timedelta(hours=1)).strftime("%H:%M")
+
+    def _explicit_time(self, transcript, hits):
+        # Every time pattern needs at least one digit
+        if _DIGIT.search(transcript):
+            for pattern in _TIME_PATTERNS:
+                match = pattern.search(transcript)
+                if match:
+                    groups = match.groups()
+                    hour = int(groups[0])
+                    minute = int(groups[1]) if len(groups) > 1 and groups[1] and groups[1].isdigit() else 0
+
+                    if len(groups) > 2 and groups[2]:
+                        period = groups[2].lower()
+                        if 'pm' in period and hour != 12:
+                            hour += 12
+                        elif 'am' in period and hour == 12:
+                            hour = 0
+                    elif len(groups) > 1 and groups[1] and not groups[1].isdigit():
+                        period = groups[1].lower()
+                        if 'pm' in period and hour != 12:
+                            hour += 12
+                        elif 'am' in period and hour == 12:
+                            hour = 0
+
+                    return f"{hour:02d}:{minute:02d}"
+
         # Time keywords
-        time_keywords = {
-            'morning': '09:00', 'noon': '12:00', 'afternoon': '14:00',
-            'evening': '18:00', 'night': '20:00', 'midnight': '00:00'
-        }
-        
-        for keyword, time in time_keywords.items():
-            if keyword in transcript:
+        for keyword, time in TIME_KEYWORDS.items():
+            if keyword in hits:
                 return time
-        
-        return (datetime.now() + timedelta(hours=1)).strftime("%H:%M")
 
-    def _extract_duration(self, transcript):
+        return None
+
+    def _extract_duration(self, transcript, hits):
         # Explicit duration
-        duration_match = re.search(r'(\d+)\s*(hour|hours|hr|hrs|minute|minutes|min|mins)', transcript)
+        duration_match = _DURATION.search(transcript) if _DIGIT.search(transcript) else None
         if duration_match:
             value = int(duration_match.group(1))
             unit = duration_match.group(2).lower()
             return value * 60 if 'hour' in unit or 'hr' in unit else value
-        
+
         # Duration by category
-        duration_map = {
-            'meeting': 60, 'call': 30, 'conference': 120, 'standup': 15,
-            'lunch': 60, 'dinner': 90, 'breakfast': 30,
-            'workout': 60, 'gym': 90, 'run': 30,
-            'appointment': 45, 'checkup': 30, 'interview': 60,
-            'class': 90, 'lecture': 120, 'seminar': 180,
-            'break': 15
-        }
-        
-        for keyword, duration in duration_map.items():
-            if keyword in transcript:
+        for keyword, duration in DURATION_KEYWORDS.items():
+            if keyword in hits:
                 return duration
-        
+
         return 60
 
-    def _extract_category(self, transcript):
-        categories = {
-            'meeting': ['meeting', 'call', 'conference', 'sync', 'standup', 'discussion'],
-            'work': ['work', 'project', 'task', 'coding', 'development', 'review'],
-            'personal': ['lunch', 'dinner', 'breakfast', 'gym', 'workout', 'run', 'break'],
-            'health': ['doctor', 'appointment', 'checkup', 'dentist', 'hospital'],
-            'education': ['class', 'lecture', 'seminar', 'study', 'exam', 'course'],
-            'social': ['party', 'event', 'celebration', 'birthday', 'wedding']
-        }
-        
-        for category, keywords in categories.items():
-            if any(word in transcript for word in keywords):
+    def _extract_category(self, transcript, hits):
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            if any(word in hits for word in keywords):
                 return category
-        
+
         return 'general'
 
-    def _extract_priority(self, transcript):
-        high_priority = ['urgent', 'important', 'critical', 'asap', 'priority', 'emergency']
-        low_priority = ['optional', 'maybe', 'if possible', 'casual', 'flexible']
-        
-        if any(word in transcript for word in high_priority):
+    def _extract_priority(self, transcript, hits):
+        if any(word in hits for word in HIGH_PRIORITY):
             return 'high'
-        elif any(word in transcript for word in low_priority):
+        elif any(word in hits for word in LOW_PRIORITY):
             return 'low'
-        
+
         # Auto-priority based on category
-        if any(word in transcript for word in ['doctor', 'hospital', 'emergency']):
+        if any(word in hits for word in HIGH_PRIORITY_TOPICS):
             return 'high'
-        elif any(word in transcript for word in ['meeting', 'interview', 'exam']):
+        elif any(word in hits for word in MEDIUM_PRIORITY_TOPICS):
             return 'medium'
-        
+
         return 'medium'
 
-    def _extract_location(self, transcript):
-        location_patterns = [
-            r'at\s+([A-Za-z\s]+?)(?:\s+(?:on|at|with|for)|\s*$)',
-            r'in\s+([A-Za-z\s]+?)(?:\s+(?:on|at|with|for)|\s*$)',
-            r'room\s+(\w+)',
-            r'conference\s+room\s+(\w+)'
-        ]
-        
+    def _extract_location(self, transcript, hits):
+        location_patterns = []
+        if 'at' in hits:
+            location_patterns.append(_LOCATION_AT)
+        if 'in' in hits:
+            location_patterns.append(_LOCATION_IN)
+        if 'room' in hits:
+            location_patterns += [_LOCATION_ROOM, _LOCATION_CONFERENCE_ROOM]
+
         for pattern in location_patterns:
-            match = re.search(pattern, transcript, re.IGNORECASE)
+            match = pattern.search(transcript)
             if match:
                 location = match.group(1).strip()
-                if len(location) > 2 and not any(word in location.lower() for word in ['today', 'tomorrow', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']):
+                if len(location) > 2 and not any(word in location.lower() for word in DATE_WORDS):
                     return location.title()
-        
+
         # Common locations
-        locations = ['office', 'home', 'gym', 'hospital', 'school', 'university', 'library']
-        for loc in locations:
-            if loc in transcript:
+        for loc in COMMON_LOCATIONS:
+            if loc in hits:
                 return loc.title()
-        
-        if any(word in transcript for word in ['online', 'zoom', 'teams', 'skype', 'virtual']):
+
+        if any(word in hits for word in ONLINE_WORDS):
             return 'Online'
-        
+
         return None
 
-    def _extract_participants(self, transcript):
+    def _extract_participants(self, transcript, hits):
         participants = []
-        
+
         # "with [name]" pattern
-        with_pattern = r'with\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        matches = re.findall(with_pattern, transcript, re.IGNORECASE)
-        participants.extend([name.title() for name in matches])
-        
+        if 'with' in hits:
+            participants.extend([name.title() for name in _PARTICIPANTS.findall(transcript)])
+
         # Team/group patterns
-        if 'team' in transcript:
+        if 'team' in hits:
             participants.append('Team')
-        if 'everyone' in transcript or 'all' in transcript:
+        if 'everyone' in hits or 'all' in hits:
             participants.append('Everyone')
-        
+
         return participants
 
-    def _calculate_confidence(self, transcript):
+    def _calculate_confidence(self, transcript, hits):
         confidence = 0.5
-        
+
         # Time specified
-        if re.search(r'\d{1,2}:?\d{0,2}\s*(am|pm)', transcript):
+        if ('am' in hits or 'pm' in hits) and _CONFIDENCE_TIME.search(transcript):
             confidence += 0.2
-        
+
         # Date specified
-        if any(word in transcript for word in ['today', 'tomorrow', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']):
+        if hits & _DATE_WORD_SET:
             confidence += 0.15
-        
+
         # Specific date
-        if re.search(r'\d{1,2}\s+(january|february|march|april|may|june|july|august|september|october|november|december)', transcript):
+        if hits & _MONTH_SET and _CONFIDENCE_DATE.search(transcript):
             confidence += 0.2
-        
+
         # Clear action word
-        if any(word in transcript for word in ['schedule', 'add', 'create', 'book', 'plan']):
+        if hits & _ACTION_WORD_SET:
             confidence += 0.1
-        
+
         # Detailed command
         if len(transcript.split()) > 5:
             confidence += 0.1
-        
+
         return min(confidence, 1.0)
 
-    def _get_suggestions(self, transcript, category):
+    def _get_suggestions(self, transcript, category, hits):
         suggestions = []
-        
-        if category == 'meeting' and 'with' not in transcript:
+
+        if category == 'meeting' and 'with' not in hits:
             suggestions.append("Consider adding participants")
-        
-        if not re.search(r'at|in', transcript):
+
+        if 'at' not in hits and 'in' not in hits:
             suggestions.append("You might want to specify a location")
-        
-        if category in ['meeting', 'appointment'] and not re.search(r'\d+\s*(hour|minute)', transcript):
+
+        if category in ['meeting', 'appointment'] and not _SUGGESTION_DURATION.search(transcript):
             suggestions.append("Consider specifying duration")
-        
-        return suggestions
\ No newline at end of file
+
+        return suggestions
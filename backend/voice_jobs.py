@@ -0,0 +1,145 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+
+logger = logging.getLogger('planifyai.voice_jobs')
+
+class QueueFull(Exception):
+    pass
+
+class Job:
+    def __init__(self, transcript):
+        self.id = uuid.uuid4().hex
+        self.transcript = transcript
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.event_id = None
+        self.insight_id = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+
+class VoiceJobQueue:
+    """Bounded in-process job queue served by a fixed pool of worker threads.
+
+    submit() fails fast with QueueFull instead of blocking when maxsize jobs
+    are waiting, so callers can shed load. Each job runs handler(job) inside
+    an app context. Finished jobs stay in memory for long-polling, up to
+    `retention` of them. Handlers persist whatever other processes need to
+    see.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.handler = None
+        self.workers = 0
+        self.maxsize = 0
+        self.retention = 1000
+        self.running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._queue = None
+        self._threads = []
+        self._jobs = {}
+        self._finished = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def started(self):
+        return bool(self._threads)
+
+    @property
+    def depth(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self, app, handler, workers=2, maxsize=100):
+        if self._threads:
+            return
+        self.app, self.handler = app, handler
+        self.workers, self.maxsize = workers, maxsize
+        self._queue = queue.Queue(maxsize)
+        for n in range(workers):
+            thread = threading.Thread(target=self._run, name=f'voice-job-{n}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, job):
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+                self.rejected += 1
+            raise QueueFull(f'{self.maxsize} voice jobs already queued')
+        with self._lock:
+            self.submitted += 1
+        return job
+
+    def accepting(self):
+        """Cheap capacity check before doing any work for a new job; a refusal counts as rejected."""
+        if self._queue is not None and not self._queue.full():
+            return True
+        with self._lock:
+            self.rejected += 1
+        return False
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def close(self, timeout=None):
+        # Jobs already queued are drained before the workers exit
+        threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'maxsize': self.maxsize,
+            'queued': self.depth,
+            'running': self.running,
+            'submitted': self.submitted,
+            'rejected': self.rejected,
+            'completed': self.completed,
+            'failed': self.failed
+        }
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.status = 'running'
+            job.started = time.time()
+            with self._lock:
+                self.running += 1
+            try:
+                with self.app.app_context():
+                    self.handler(job)
+            except Exception as e:
+                logger.exception('Voice job %s failed', job.id)
+                job.status = 'failed'
+                job.error = str(e)
+            job.finished = time.time()
+            with self._lock:
+                self.running -= 1
+                if job.status == 'failed':
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                self._finished.append(job.id)
+                while len(self._finished) > self.retention:
+                    self._jobs.pop(self._finished.popleft(), None)
+            job.done.set()
@@ -18,7 +18,9 @@ CREATE TABLE IF NOT EXISTS events (
     category VARCHAR(50) DEFAULT 'general',
     priority ENUM('low', 'medium', 'high') DEFAULT 'medium',
     is_recurring BOOLEAN DEFAULT FALSE,
-    recurring_pattern VARCHAR(100),
+    -- RRULE subset, e.g. FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20241231;EXDATE=20240115
+    -- (existing installs: ALTER TABLE events MODIFY recurring_pattern TEXT;)
+    recurring_pattern TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_date (date),
@@ -26,6 +28,56 @@ CREATE TABLE IF NOT EXISTS events (
     INDEX idx_priority (priority)
 );
 
+-- Create event_changes table (change log for incremental sync; version is the sync token)
+CREATE TABLE IF NOT EXISTS event_changes (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    event_id INT NOT NULL,
+    operation ENUM('upsert', 'delete') NOT NULL,
+    version BIGINT NOT NULL,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_event_id (event_id),
+    INDEX idx_version (version)
+);
+
+-- Create sync_state table (one row; writers bump version under its row lock
+-- until commit, so sync tokens become visible in commit order)
+CREATE TABLE IF NOT EXISTS sync_state (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+INSERT IGNORE INTO sync_state (id, version) VALUES (1, 0);
+
+-- Create voice_jobs table (async voice parsing; finished rows are purged
+-- after VOICE_JOB_RETENTION_HOURS)
+CREATE TABLE IF NOT EXISTS voice_jobs (
+    id CHAR(32) PRIMARY KEY,
+    transcript TEXT NOT NULL,
+    status ENUM('queued', 'done', 'failed') NOT NULL DEFAULT 'queued',
+    result TEXT,
+    error TEXT,
+    event_id INT,
+    insight_id INT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP NULL,
+    INDEX idx_finished_at (finished_at)
+);
+
+-- Create analytics aggregate tables (maintained on every event write;
+-- rebuild with `flask --app app rebuild-stats`)
+CREATE TABLE IF NOT EXISTS event_daily_stats (
+    date DATE NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    event_count INT NOT NULL DEFAULT 0,
+    total_minutes INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, category)
+);
+
+CREATE TABLE IF NOT EXISTS event_category_stats (
+    category VARCHAR(50) PRIMARY KEY,
+    event_count INT NOT NULL DEFAULT 0,
+    total_minutes INT NOT NULL DEFAULT 0
+);
+
 -- Create time_blocks table
 CREATE TABLE IF NOT EXISTS time_blocks (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -101,6 +153,21 @@ INSERT INTO events (title, description, date, start_time, end_time, category, pr
 ('Code Review', 'Review team pull requests', DATE_ADD(CURDATE(), INTERVAL 1 DAY), '11:00', '12:00', 'work', 'medium'),
 ('Lunch Break', 'Lunch with team', CURDATE(), '12:00', '13:00', 'break', 'low');
 
+-- Fill the analytics aggregates from the sample events (what
+-- `flask --app app rebuild-stats` computes)
+INSERT INTO event_daily_stats (date, category, event_count, total_minutes)
+SELECT date, COALESCE(category, 'general'), COUNT(*),
+       SUM(GREATEST(TIME_TO_SEC(end_time) - TIME_TO_SEC(start_time), 0) DIV 60)
+FROM events
+GROUP BY date, COALESCE(category, 'general')
+ON DUPLICATE KEY UPDATE event_count = VALUES(event_count), total_minutes = VALUES(total_minutes);
+
+INSERT INTO event_category_stats (category, event_count, total_minutes)
+SELECT category, SUM(event_count), SUM(total_minutes)
+FROM event_daily_stats
+GROUP BY category
+ON DUPLICATE KEY UPDATE event_count = VALUES(event_count), total_minutes = VALUES(total_minutes);
+
 -- Insert sample time blocks
 INSERT INTO time_blocks (title, date, start_time, end_time, block_type, description) VALUES
 ('Morning Focus Block', CURDATE(), '08:00', '10:00', 'focus', 'Dedicated time for deep work'),
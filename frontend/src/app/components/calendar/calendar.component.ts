@@ -131,7 +131,7 @@ import { HttpClient } from '@angular/common/http';
           </button>
         </div>
 
-        <div *ngIf="lastCommand || voiceResult" class="voice-feedback">
+        <div *ngIf="lastCommand || voiceResult || voiceError" class="voice-feedback">
           <div class="transcript">
             <label><strong>What you said:</strong></label>
             <textarea [(ngModel)]="lastCommand" 
@@ -143,6 +143,8 @@ import { HttpClient } from '@angular/common/http';
             </button>
           </div>
           
+          <div *ngIf="voiceError" class="voice-error">⚠️ {{voiceError}}</div>
+
           <div *ngIf="voiceResult" class="ai-interpretation">
             <div class="interpretation-header">
               <strong>AI understood:</strong>
@@ -194,7 +196,7 @@ import { HttpClient } from '@angular/common/http';
             </div>
             
             <div class="action-buttons">
-              <button class="confirm-btn" (click)="confirmEvent()">✅ Add to Calendar</button>
+              <button class="confirm-btn" (click)="confirmEvent()">{{voiceResult.eventId ? '✅ Save Changes' : '✅ Add to Calendar'}}</button>
               <button class="retry-btn" (click)="retryVoice()">🔄 Try Again</button>
               <button class="cancel-btn" (click)="cancelVoice()">❌ Cancel</button>
             </div>
@@ -335,6 +337,7 @@ import { HttpClient } from '@angular/common/http';
     .transcript label { display: block; margin-bottom: 0.5rem; font-weight: 600; }
     .transcript-edit { width: 100%; min-height: 60px; padding: 0.75rem; border: 1px solid rgba(255,255,255,0.3); border-radius: 6px; background: rgba(255,255,255,0.2); color: white; resize: vertical; font-family: inherit; }
     .reprocess-btn { margin-top: 0.5rem; padding: 0.5rem 1rem; background: #5a6fd8; color: white; border: none; border-radius: 6px; cursor: pointer; }
+    .voice-error { background: rgba(220,53,69,0.3); border-radius: 8px; padding: 1rem; margin-bottom: 1rem; }
     .ai-interpretation { background: rgba(255,255,255,0.15); border-radius: 8px; padding: 1.5rem; }
     .interpretation-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem; }
     .confidence-badge { padding: 0.25rem 0.75rem; border-radius: 15px; font-size: 0.8rem; font-weight: 600; }
@@ -375,6 +378,8 @@ export class CalendarComponent implements OnInit {
   hours = Array.from({length: 24}, (_, i) => i);
   calendarDays: any[] = [];
   events: any[] = [];
+  syncToken: string | null = null;
+  loadGeneration = 0;
   analytics: any = { categories: [], weeklyEvents: 0, totalEvents: 0 };
   showDashboard = false;
   editingEvent: any = null;
@@ -383,6 +388,7 @@ export class CalendarComponent implements OnInit {
   isProcessing = false;
   lastCommand = '';
   voiceResult: any = null;
+  voiceError = '';
   recognition: any;
 
   constructor(private http: HttpClient) {}
@@ -399,6 +405,7 @@ export class CalendarComponent implements OnInit {
     if (view === 'Day') {
       this.selectedDate = new Date(this.currentDate);
     }
+    this.loadEvents();
   }
 
   getTitle(): string {
@@ -422,6 +429,7 @@ export class CalendarComponent implements OnInit {
       this.selectedDate.setDate(this.selectedDate.getDate() - 1);
     }
     this.updateCalendar();
+    this.loadEvents();
   }
 
   nextPeriod() {
@@ -433,12 +441,14 @@ export class CalendarComponent implements OnInit {
       this.selectedDate.setDate(this.selectedDate.getDate() + 1);
     }
     this.updateCalendar();
+    this.loadEvents();
   }
 
   goToday() {
     this.currentDate = new Date();
     this.selectedDate = new Date();
     this.updateCalendar();
+    this.loadEvents();
   }
 
   toggleDashboard() {
@@ -505,16 +515,98 @@ export class CalendarComponent implements OnInit {
     return maxCount > 0 ? (count / maxCount) * 100 : 0;
   }
 
-  loadEvents() {
-    this.http.get<any[]>('http://localhost:5000/api/events').subscribe({
-      next: (events) => {
-        this.events = events;
-        this.updateCalendar();
+  visibleRange(): { from: string, to: string } {
+    let start: Date;
+    let days: number;
+    if (this.currentView === 'Month') {
+      start = new Date(this.currentDate.getFullYear(), this.currentDate.getMonth(), 1);
+      start.setDate(start.getDate() - start.getDay());
+      days = 42;
+    } else if (this.currentView === 'Week') {
+      start = new Date();
+      start.setDate(start.getDate() - start.getDay());
+      days = 7;
+    } else {
+      start = new Date(this.selectedDate);
+      days = 1;
+    }
+    // One day of margin each side: the week and day views key on UTC dates
+    const from = new Date(start);
+    from.setDate(from.getDate() - 1);
+    const to = new Date(start);
+    to.setDate(to.getDate() + days);
+    return { from: this.toIsoDate(from), to: this.toIsoDate(to) };
+  }
+
+  toIsoDate(date: Date): string {
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${date.getFullYear()}-${month}-${day}`;
+  }
+
+  loadEvents(cursor: string | null = null) {
+    // Only the visible range is fetched (with recurring series expanded),
+    // following X-Next-Cursor until the last page
+    if (cursor === null) {
+      this.loadGeneration++;
+    }
+    const generation = this.loadGeneration;
+    const range = this.visibleRange();
+    let url = `http://localhost:5000/api/events?from=${range.from}&to=${range.to}`;
+    if (cursor !== null) {
+      url += `&cursor=${encodeURIComponent(cursor)}`;
+    }
+    this.http.get<any[]>(url, { observe: 'response' }).subscribe({
+      next: (response) => {
+        if (generation !== this.loadGeneration) {
+          return;  // superseded by navigation
+        }
+        const page = response.body || [];
+        if (cursor === null) {
+          this.events = page;
+          this.syncToken = response.headers.get('X-Sync-Token');
+        } else {
+          this.events = this.events.concat(page);
+        }
+        const next = response.headers.get('X-Next-Cursor');
+        if (next) {
+          this.loadEvents(next);
+        } else {
+          this.updateCalendar();
+        }
       },
       error: () => console.log('Database not connected')
     });
   }
 
+  syncEvents() {
+    if (this.syncToken === null) {
+      this.loadEvents();
+      return;
+    }
+    this.http.get<any>(`http://localhost:5000/api/events/changes?since=${this.syncToken}`).subscribe({
+      next: (delta) => {
+        if (delta.reset || delta.events.some((e: any) => e.isRecurring)) {
+          // Too many changes for one page, or a series changed (changes carry
+          // the stored series; its occurrences come from a reload)
+          this.loadEvents();
+          return;
+        }
+        const range = this.visibleRange();
+        const removed = new Set([...delta.deleted, ...delta.events.map((e: any) => e.id)]);
+        const visible = delta.events.filter((e: any) => e.date >= range.from && e.date <= range.to);
+        this.events = this.events.filter(e => !removed.has(e.id)).concat(visible);
+        this.syncToken = String(delta.syncToken);
+        if (delta.hasMore) {
+          this.syncEvents();
+        } else {
+          this.updateCalendar();
+        }
+      },
+      error: () => this.loadEvents()
+    });
+  }
+
   loadAnalytics() {
     this.http.get<any>('http://localhost:5000/api/analytics').subscribe({
       next: (data) => {
@@ -536,7 +628,7 @@ export class CalendarComponent implements OnInit {
     if (this.editingEvent) {
       this.http.put(`http://localhost:5000/api/events/${this.editingEvent.id}`, this.editingEvent).subscribe({
         next: () => {
-          this.loadEvents();
+          this.syncEvents();
           this.loadAnalytics();
           this.closeEditModal();
         },
@@ -549,7 +641,7 @@ export class CalendarComponent implements OnInit {
     if (this.editingEvent && confirm('Delete this event?')) {
       this.http.delete(`http://localhost:5000/api/events/${this.editingEvent.id}`).subscribe({
         next: () => {
-          this.loadEvents();
+          this.syncEvents();
           this.loadAnalytics();
           this.closeEditModal();
         },
@@ -595,24 +687,59 @@ export class CalendarComponent implements OnInit {
     } else {
       this.isListening = true;
       this.voiceResult = null;
+      this.voiceError = '';
       this.recognition.start();
     }
   }
 
   processVoiceCommand(transcript: string) {
-    this.http.post('http://localhost:5000/api/ai/process-voice', { transcript }).subscribe({
-      next: (result: any) => {
-        this.voiceResult = result;
+    this.voiceError = '';
+    this.http.post<any>('http://localhost:5000/api/ai/jobs', { transcript }).subscribe({
+      next: (job) => this.pollVoiceJob(job.id),
+      error: () => {
         this.isProcessing = false;
+        this.voiceError = 'Could not send the command, please try again.';
+      }
+    });
+  }
+
+  pollVoiceJob(jobId: string, attempt = 1) {
+    // Long-poll: the server answers as soon as the job finishes. Give up
+    // after about two minutes rather than waiting on a stuck job forever.
+    this.http.get<any>(`http://localhost:5000/api/ai/jobs/${jobId}?wait=20`).subscribe({
+      next: (job) => {
+        if (job.status === 'queued' || job.status === 'running') {
+          if (attempt < 6) {
+            this.pollVoiceJob(jobId, attempt + 1);
+          } else {
+            this.isProcessing = false;
+            this.voiceError = 'The command is taking too long, please try again.';
+          }
+          return;
+        }
+        this.isProcessing = false;
+        if (!job.result?.success) {
+          this.voiceResult = null;
+          this.voiceError = job.result?.error || job.error || 'Could not understand the command.';
+          return;
+        }
+        this.voiceResult = { ...job.result, eventId: job.eventId };
+        if (job.eventId) {
+          // Confident, conflict-free commands are saved straight away
+          this.syncEvents();
+          this.loadAnalytics();
+        }
       },
       error: () => {
         this.isProcessing = false;
+        this.voiceError = 'Could not get the result, please try again.';
       }
     });
   }
 
   onTranscriptEdit() {
     this.voiceResult = null;
+    this.voiceError = '';
   }
 
   reprocessCommand() {
@@ -639,12 +766,16 @@ export class CalendarComponent implements OnInit {
         priority: this.voiceResult.event.priority
       };
 
-      this.http.post('http://localhost:5000/api/events', eventData).subscribe({
+      const eventId = this.voiceResult.eventId;
+      const request = eventId
+        ? this.http.put(`http://localhost:5000/api/events/${eventId}`, eventData)
+        : this.http.post('http://localhost:5000/api/events', eventData);
+      request.subscribe({
         next: () => {
-          this.loadEvents();
+          this.syncEvents();
           this.loadAnalytics();
           this.cancelVoice();
-          alert('Event created successfully!');
+          alert(eventId ? 'Event updated successfully!' : 'Event created successfully!');
         },
         error: () => console.log('Error creating event')
       });
@@ -659,6 +790,7 @@ export class CalendarComponent implements OnInit {
 
   cancelVoice() {
     this.voiceResult = null;
+    this.voiceError = '';
     this.lastCommand = '';
     this.isProcessing = false;
   }